@@ -16,9 +16,9 @@ from typing import Optional, List, Dict, Any
 import discord
 from discord.ext import commands
 
-from utils.db import cleanup_old_data, get_database_stats, get_recent_errors
+from utils.db import acleanup_old_data, aget_database_stats, aget_recent_errors
 from utils.error_notifications import test_webhook, log_security_event
-from utils.helpers import load_config, save_config, get_system_info
+from utils.helpers import load_config, save_config, get_system_info, invalidate_instructions_cache
 from utils.ai import get_ai_status
 from utils.auth import get_auth_manager, is_owner
 
@@ -183,14 +183,14 @@ class AdminCommands(commands.Cog):
             message = await ctx.send(embed=embed)
             
             # Get stats before cleanup
-            stats_before = get_database_stats()
+            stats_before = await aget_database_stats()
             
             # Perform cleanup
-            success = cleanup_old_data(days)
+            success = await acleanup_old_data(days)
             
             if success:
                 # Get stats after cleanup
-                stats_after = get_database_stats()
+                stats_after = await aget_database_stats()
                 
                 # Calculate cleaned records
                 conv_cleaned = stats_before.get('conversation_records', 0) - stats_after.get('conversation_records', 0)
@@ -239,7 +239,7 @@ class AdminCommands(commands.Cog):
             
             if log_type.lower() == "error":
                 # Get recent errors
-                errors = get_recent_errors(limit)
+                errors = await aget_recent_errors(limit)
                 
                 if not errors:
                     await ctx.send("✅ No recent errors found")
@@ -252,7 +252,7 @@ class AdminCommands(commands.Cog):
                 )
                 
                 for i, error in enumerate(errors[:5]):  # Show top 5 in detail
-                    timestamp = datetime.fromisoformat(error['timestamp']).strftime('%m/%d %H:%M')
+                    timestamp = datetime.fromtimestamp(error['timestamp']).strftime('%m/%d %H:%M')
                     embed.add_field(
                         name=f"{i+1}. {error['error_type']} - {timestamp}",
                         value=f"```{error['error_message'][:200]}{'...' if len(error['error_message']) > 200 else ''}```",
@@ -543,6 +543,7 @@ class AdminCommands(commands.Cog):
                 try:
                     with open(instructions_path, 'w', encoding='utf-8') as f:
                         f.write(content)
+                    invalidate_instructions_cache()
                     
                     await ctx.send("✅ AI instructions updated successfully")
                     
@@ -583,6 +584,7 @@ Additional guidelines:
                 try:
                     with open(instructions_path, 'w', encoding='utf-8') as f:
                         f.write(default_instructions)
+                    invalidate_instructions_cache()
                     
                     await ctx.send("✅ AI instructions reset to default")
                     
@@ -612,6 +614,8 @@ Additional guidelines:
             
             if auth_manager.add_user(user_id):
                 await ctx.send(f"✅ User {user_id} has been added to authorized users")
+                if auth_manager.save_failed:
+                    await ctx.send("⚠️ Saving the authorized users file is failing; the change is kept in memory and the save will be retried")
                 
                 # Log the addition
                 await log_security_event(
@@ -636,6 +640,8 @@ Additional guidelines:
             
             if auth_manager.remove_user(user_id):
                 await ctx.send(f"✅ User {user_id} has been removed from authorized users")
+                if auth_manager.save_failed:
+                    await ctx.send("⚠️ Saving the authorized users file is failing; the change is kept in memory and the save will be retried")
                 
                 # Log the removal
                 await log_security_event(
@@ -709,7 +715,7 @@ Additional guidelines:
             success = auth_manager.load_authorized_users()
             
             if success:
-                await ctx.send("✅ Authorization configuration reloaded successfully")
+                await ctx.send(f"✅ Authorization configuration reloaded from `{os.path.basename(auth_manager.auth_file)}`")
             else:
                 await ctx.send("❌ Failed to reload authorization configuration")
                 
@@ -17,7 +17,7 @@ from discord.ext import commands
 from utils.db import (
     add_channel, remove_channel, get_channels, 
     add_ignored_user, remove_ignored_user, get_ignored_users,
-    get_user_stats, get_database_stats, cleanup_old_data
+    get_user_stats, aget_database_stats, acleanup_old_data
 )
 from utils.ai import get_ai_status, get_available_models, analyze_sentiment
 from utils.error_notifications import webhook_log, test_webhook, get_error_stats
@@ -225,7 +225,7 @@ class GeneralCommands(commands.Cog):
             )
 
             # Database Statistics
-            db_stats = get_database_stats()
+            db_stats = await aget_database_stats()
             embed.add_field(
                 name="💾 Database",
                 value=f"**Conversations:** {db_stats.get('conversation_records', 0)}\n"
@@ -400,14 +400,13 @@ class GeneralCommands(commands.Cog):
         try:
             if user:
                 # Clear specific user's history
-                if user.id in self.bot.state.message_history:
-                    del self.bot.state.message_history[user.id]
+                if self.bot.state.clear_history(user.id):
                     await ctx.send(f"✅ Cleared conversation history for {user.mention}")
                 else:
                     await ctx.send(f"❌ No conversation history found for {user.mention}")
             else:
                 # Clear all history
-                self.bot.state.message_history.clear()
+                self.bot.state.clear_history()
                 await ctx.send("✅ Cleared all conversation history")
 
         except Exception as e:
@@ -459,10 +458,11 @@ class GeneralCommands(commands.Cog):
                         inline=True
                     )
 
+                    last_message = stats['last_message']
                     embed.add_field(
                         name="📊 This Channel",
                         value=f"**Hourly count:** {stats['hourly_count']}\n"
-                              f"**Last auto message:** {stats['last_message'] or 'Never'}",
+                              f"**Last auto message:** {datetime.fromtimestamp(last_message).strftime('%m/%d %H:%M') if last_message else 'Never'}",
                         inline=True
                     )
 
@@ -692,7 +692,7 @@ class GeneralCommands(commands.Cog):
             )
 
             # Database stats
-            db_stats = get_database_stats()
+            db_stats = await aget_database_stats()
             embed.add_field(
                 name="💾 Database",
                 value=f"**Conversations:** {db_stats.get('conversation_records', 0):,}\n"
@@ -740,7 +740,7 @@ class GeneralCommands(commands.Cog):
 
             # Current session stats
             active_conversations = len(self.bot.state.active_conversations)
-            message_queues = sum(len(q) for q in self.bot.state.message_queues.values())
+            message_queues = sum(q.qsize() for q in self.bot.state.channel_queues.values())
 
             embed.add_field(
                 name="📈 Current Session",
@@ -777,7 +777,7 @@ class GeneralCommands(commands.Cog):
             await ctx.send("✅ Cleaning up old data (this may take a while)...")
 
             # Cleanup
-            deleted = cleanup_old_data(days)
+            deleted = await acleanup_old_data(days)
 
             await ctx.send(f"✅ Successfully cleaned up {deleted} records")
 
@@ -18,7 +18,6 @@ import threading
 import signal
 from datetime import datetime, timedelta
 from collections import deque, defaultdict
-from asyncio import Lock
 from typing import Dict, Set, List, Optional, Tuple
 
 from utils.helpers import (
@@ -29,7 +28,7 @@ from utils.helpers import (
     load_config,
 )
 from utils.db import init_db, get_channels, get_ignored_users
-from utils.error_notifications import webhook_log
+from utils.error_notifications import webhook_log_batch, close_notifications
 from colorama import init, Fore, Style
 
 # Initialize colorama for cross-platform colored terminal output
@@ -57,8 +56,14 @@ def check_config():
     
     if not os.path.exists(env_path) or not os.path.exists(config_path):
         print("Config files are not setup! Running automatic setup...")
+        # Explicitly non-interactive setup, configured from environment variables
+        if os.getenv('DISCORDAI_NONINTERACTIVE'):
+            import utils.setup as setup
+            if not setup.create_config_from_env():
+                print("Failed to create configuration from environment variables!")
+                sys.exit(1)
         # For automated environments like Replit, Render, etc., use non-interactive setup
-        if (os.getenv('REPLIT_ENVIRONMENT') or 
+        elif (os.getenv('REPLIT_ENVIRONMENT') or 
             os.getenv('CODESPACE_NAME') or 
             os.getenv('RENDER') or 
             os.getenv('PORT') or 
@@ -111,11 +116,11 @@ update_available = display_update_notice()
 config = load_config()
 
 # Import AI utilities after config is loaded
-from utils.ai import init_ai
+from utils.ai import init_ai, close_ai
 from dotenv import load_dotenv
 from discord.ext import commands
 from utils.ai import generate_response, generate_response_image
-from utils.split_response import split_response
+from utils.split_response import iter_split_response
 from utils.auth import get_auth_manager
 from web_server import start_health_server, stop_health_server
 
@@ -123,9 +128,8 @@ from web_server import start_health_server, stop_health_server
 env_path = get_env_path()
 load_dotenv(dotenv_path=env_path, override=True)
 
-# Initialize database and AI
+# Initialize database (AI clients are created per run in setup_hook)
 init_db()
-init_ai()
 
 # Bot configuration from config file
 TOKEN = os.getenv("DISCORD_TOKEN")
@@ -139,8 +143,20 @@ STARTUP_DELAY = random.uniform(3.0, 8.0)
 logger.info(f"Starting in {STARTUP_DELAY:.1f}s to avoid detection...")
 time.sleep(STARTUP_DELAY)
 
+class SelfBot(commands.Bot):
+    """Bot that releases its loop-bound resources when it closes"""
+    
+    async def close(self):
+        """Close the health server and HTTP clients on the bot's own loop, then disconnect"""
+        for cleanup in (stop_health_server, close_ai, close_notifications):
+            try:
+                await cleanup()
+            except Exception as e:
+                logger.error(f"Error during shutdown cleanup ({cleanup.__name__}): {e}")
+        await super().close()
+
 # Enhanced bot setup with discord.py-self compatible configuration
-bot = commands.Bot(
+bot = SelfBot(
     command_prefix=PREFIX,
     help_command=None,
     case_insensitive=True,
@@ -171,7 +187,8 @@ class BotState:
         self.owner_id = OWNER_ID
         self.active_channels: Set[int] = set(get_channels())
         self.ignore_users: Set[int] = set(get_ignored_users())
-        self.message_history: Dict[int, List[str]] = defaultdict(list)
+        self.message_history: Dict[int, deque] = {}
+        self.history_last_touch: Dict[int, float] = {}
         self.paused = False
         self.maintenance_mode = False
         self.allow_dm = config["bot"]["allow_dm"]
@@ -186,9 +203,6 @@ class BotState:
         # Enhanced anti-spam and rate limiting
         self.user_message_counts: Dict[int, List[float]] = defaultdict(list)
         self.user_cooldowns: Dict[int, float] = {}
-        self.message_queues: Dict[int, deque] = defaultdict(deque)
-        self.processing_locks: Dict[int, Lock] = defaultdict(Lock)
-        self.user_message_batches: Dict[str, Dict] = {}
         self.active_conversations: Dict[str, float] = {}
         
         # Enhanced security features
@@ -196,6 +210,30 @@ class BotState:
         self.last_activity: Dict[int, float] = {}
         self.typing_delays: Dict[int, float] = {}
         
+        self.reset_run_state()
+    
+    def clear_history(self, user_id: Optional[int] = None) -> bool:
+        """Drop one user's conversation history (or everyone's) with its GC entry
+        
+        Returns whether there was anything to clear for the given user.
+        """
+        if user_id is None:
+            self.message_history.clear()
+            self.history_last_touch.clear()
+            return True
+        self.history_last_touch.pop(user_id, None)
+        return self.message_history.pop(user_id, None) is not None
+    
+    def reset_run_state(self):
+        """Drop state tied to a previous bot.run event loop
+        
+        Channel queues, their in-flight batches and the webhook queue belong to
+        tasks that die with the loop, so every run starts with fresh ones.
+        """
+        self.channel_queues: Dict[int, asyncio.Queue] = {}
+        self.user_message_batches: Dict[str, Dict] = {}
+        # Pending (message, error) events for the batched webhook drain
+        self.webhook_queue: asyncio.Queue = asyncio.Queue()
 
     @property
     def instructions(self) -> str:
@@ -210,7 +248,17 @@ SPAM_TIME_WINDOW = 10.0
 COOLDOWN_DURATION = 60.0
 CONVERSATION_TIMEOUT = 300.0  # Extended to 5 minutes
 MAX_HISTORY = 20  # Increased history limit
+HISTORY_TTL = 86400.0  # Drop histories of users idle for 24 hours
+HISTORY_GC_INTERVAL = 3600.0  # Sweep idle histories hourly
 MAX_FAILED_ATTEMPTS = 3
+CHANNEL_WORKER_IDLE_TIMEOUT = 60.0  # Seconds before an idle channel worker exits
+RESTART_BACKOFF_BASE = 1.0  # First restart delay, doubled after every restart
+RESTART_BACKOFF_MAX = 60.0
+RESTART_STABLE_RUNTIME = 300.0  # A run this long resets the restart backoff
+WEBHOOK_BATCH_SIZE = 10  # Maximum errors recorded per drain iteration
+
+# Casual slang markers used by analyze_human_style
+CASUAL_WORDS = frozenset(('lol', 'fr', 'nah', 'yeah', 'yep', 'nope', 'idk', 'tbh', 'prolly', 'gonna', 'wanna'))
 
 def get_terminal_size() -> int:
     """Get terminal width for formatting"""
@@ -565,12 +613,18 @@ async def on_ready():
 @bot.event
 async def setup_hook():
     """Setup hook for loading extensions"""
+    # bot.run may be called again after a restart; start from a clean slate on this loop
+    bot.state.reset_run_state()
+    # close() shut down the previous run's AI HTTP client, so create the clients here
+    init_ai()
     await load_extensions()
     # Start background tasks
     bot.loop.create_task(auto_conversation_loop())
     bot.loop.create_task(async_keep_alive_monitor())
     bot.loop.create_task(async_activity_generator())
     bot.loop.create_task(async_health_checker())
+    bot.loop.create_task(history_gc_loop())
+    bot.loop.create_task(webhook_drain_loop())
 
 async def load_extensions():
     """Load bot extensions/cogs"""
@@ -652,11 +706,55 @@ async def async_health_checker():
             logger.error(f"Error in async health checker: {e}")
             await asyncio.sleep(60)
 
+async def history_gc_loop():
+    """Periodically drop conversation histories of users who have gone idle"""
+    await bot.wait_until_ready()
+    
+    while not bot.is_closed():
+        try:
+            await asyncio.sleep(HISTORY_GC_INTERVAL)
+            
+            cutoff = time.monotonic() - HISTORY_TTL
+            last_touch = bot.state.history_last_touch
+            expired = [user_id for user_id, touched in list(last_touch.items()) if touched < cutoff]
+            
+            for user_id in expired:
+                del last_touch[user_id]
+                bot.state.message_history.pop(user_id, None)
+            
+            if expired:
+                logger.info(f"Dropped conversation history for {len(expired)} idle users")
+                
+        except Exception as e:
+            logger.error(f"Error in history GC loop: {e}")
+            await asyncio.sleep(60)
+
+def queue_webhook_log(message: Optional[discord.Message], error) -> None:
+    """Queue an error for the next batched webhook notification"""
+    bot.state.webhook_queue.put_nowait((message, error))
+
+async def webhook_drain_loop():
+    """Record queued errors and hand them to the webhook notifier in batches"""
+    queue = bot.state.webhook_queue
+    
+    while True:
+        try:
+            events = [await queue.get()]
+            while len(events) < WEBHOOK_BATCH_SIZE and not queue.empty():
+                events.append(queue.get_nowait())
+            
+            # Posting, batching and rate limits are handled by the notification flusher
+            await webhook_log_batch(events)
+            
+        except Exception as e:
+            logger.error(f"Error in webhook drain loop: {e}")
+            await asyncio.sleep(5)
+
 async def auto_conversation_loop():
     """Background task to automatically initiate conversations in active channels"""
     import random
     from utils.ai import generate_auto_conversation_starter
-    from utils.db import get_channels, can_send_auto_message, record_auto_message
+    from utils.db import get_channels, acan_send_auto_message, atry_record_auto_message
     
     await bot.wait_until_ready()
     
@@ -672,6 +770,7 @@ async def auto_conversation_loop():
             # Get auto conversation settings
             chance = config.get('bot', {}).get('auto_conversation_chance', 0.15)
             interval = config.get('bot', {}).get('auto_conversation_interval', 300)
+            max_per_hour = config.get('bot', {}).get('auto_conversation_max_per_hour', 6)
             
             # Get active channels
             active_channels = get_channels()
@@ -687,7 +786,7 @@ async def auto_conversation_loop():
                         continue
                     
                     # Check if we can send auto message (rate limiting)
-                    if not can_send_auto_message(channel_id):
+                    if not await acan_send_auto_message(channel_id):
                         continue
                     
                     # Random chance to start conversation
@@ -710,6 +809,11 @@ async def auto_conversation_loop():
                     )
                     
                     if starter:
+                        # Claim the send slot atomically; another check may have used it meanwhile
+                        guild_id = channel.guild.id if channel.guild else None
+                        if not await atry_record_auto_message(channel_id, guild_id, starter[:50], max_per_hour, interval):
+                            continue
+                        
                         # Add natural delay and typing simulation
                         await asyncio.sleep(random.uniform(2, 8))
                         
@@ -721,10 +825,6 @@ async def auto_conversation_loop():
                         # Send the message
                         await channel.send(starter)
                         
-                        # Record auto message
-                        guild_id = channel.guild.id if channel.guild else None
-                        record_auto_message(channel_id, guild_id, starter[:50])
-                        
                         logger.info(f"[AUTO] Sent conversation starter in #{channel.name}: {starter}")
                         
                         # Add cooldown between auto messages across channels
@@ -772,7 +872,7 @@ def is_trigger_message(message: discord.Message) -> bool:
     
     # Enhanced conversation tracking
     conv_key = f"{message.author.id}-{message.channel.id}"
-    current_time = time.time()
+    current_time = time.monotonic()
     in_conversation = (
         conv_key in bot.state.active_conversations
         and current_time - bot.state.active_conversations[conv_key] < CONVERSATION_TIMEOUT
@@ -813,18 +913,15 @@ def analyze_human_style(message_content: str) -> str:
     elif len(message_content) <= 15:
         patterns.append("short")
     
-    # Check for common casual patterns
-    casual_words = ['lol', 'fr', 'nah', 'yeah', 'yep', 'nope', 'idk', 'tbh', 'prolly', 'gonna', 'wanna']
-    if any(word in message_content.lower() for word in casual_words):
+    # Check for common casual patterns (substring match, so "yeahhh" still counts)
+    content_lower = message_content.lower()
+    if any(word in content_lower for word in CASUAL_WORDS):
         patterns.append("casual slang")
     
     return f" [{', '.join(patterns)}]" if patterns else ""
 
-def update_message_history(author_id: int, message_content: str, is_bot_response: bool = False):
-    """Update message history for context - includes both user messages and bot responses with style analysis"""
-    if author_id not in bot.state.message_history:
-        bot.state.message_history[author_id] = []
-    
+def _append_history(history: deque, message_content: str, is_bot_response: bool = False):
+    """Append a formatted message to an author's history deque"""
     # Format the message to show who said what
     if is_bot_response:
         formatted_message = f"[BOT]: {message_content}"
@@ -833,12 +930,20 @@ def update_message_history(author_id: int, message_content: str, is_bot_response
         style_notes = analyze_human_style(message_content)
         formatted_message = f"[USER{style_notes}]: {message_content}"
     
-    bot.state.message_history[author_id].append(formatted_message)
-    bot.state.message_history[author_id] = bot.state.message_history[author_id][-MAX_HISTORY:]
+    history.append(formatted_message)  # deque maxlen keeps the last MAX_HISTORY entries
+
+def get_author_history(author_id: int) -> deque:
+    """Get (or create) an author's history deque and mark it as recently used"""
+    bot.state.history_last_touch[author_id] = time.monotonic()
+    return bot.state.message_history.setdefault(author_id, deque(maxlen=MAX_HISTORY))
+
+def update_message_history(author_id: int, message_content: str, is_bot_response: bool = False):
+    """Update message history for context - includes both user messages and bot responses with style analysis"""
+    _append_history(get_author_history(author_id), message_content, is_bot_response)
 
 async def check_spam_and_cooldown(user_id: int) -> Tuple[bool, Optional[str]]:
     """Enhanced spam detection and cooldown management"""
-    current_time = time.time()
+    current_time = time.monotonic()
     
     # Check existing cooldown
     if user_id in bot.state.user_cooldowns:
@@ -908,16 +1013,20 @@ async def generate_response_and_reply(message: discord.Message, prompt: str, his
             logger.warning("Empty response from AI")
             return
         
-        # Split response into chunks
-        chunks = split_response(response)
+        # Split response into chunks lazily, so splitting stops at the chunk limit
+        chunks = iter_split_response(response)
         
-        # Limit number of chunks to prevent spam
-        if len(chunks) > 3:
-            chunks = chunks[:3]
-            logger.info("Response truncated to prevent spam")
+        # Log interaction (console output comes from the logging StreamHandler)
+        timestamp = datetime.now().strftime("[%H:%M:%S]")
+        logger.info("%s %s: %s", timestamp, message.author.name, prompt)
         
         # Send response chunks
         for i, chunk in enumerate(chunks):
+            # Limit number of chunks to prevent spam
+            if i == 3:
+                logger.info("Response truncated to prevent spam")
+                break
+            
             # Apply mention filtering
             if DISABLE_MENTIONS:
                 chunk = chunk.replace("@", "@\u200b")
@@ -931,12 +1040,7 @@ async def generate_response_and_reply(message: discord.Message, prompt: str, his
                     flags=re.IGNORECASE,
                 )
             
-            # Log interaction
-            timestamp = datetime.now().strftime("[%H:%M:%S]")
-            logger.info(f"{timestamp} {message.author.name}: {prompt}")
-            logger.info(f"{timestamp} Responding to {message.author.name}: {chunk}")
-            print(f'{timestamp} {message.author.name}: {prompt}')
-            print(f'{timestamp} Responding to {message.author.name}: {chunk}')
+            logger.info("%s Responding to %s: %s", timestamp, message.author.name, chunk)
             print_separator()
             
             try:
@@ -963,26 +1067,26 @@ async def generate_response_and_reply(message: discord.Message, prompt: str, his
                 
                 # Update conversation timestamp
                 conv_key = f"{message.author.id}-{message.channel.id}"
-                bot.state.active_conversations[conv_key] = time.time()
+                bot.state.active_conversations[conv_key] = time.monotonic()
                 
             except discord.errors.HTTPException as e:
                 logger.error(f"HTTP error sending message: {e}")
-                await webhook_log(message, str(e))
+                queue_webhook_log(message, str(e))
                 break
             except discord.errors.Forbidden as e:
                 logger.error("Missing permissions to send message")
-                await webhook_log(message, "Missing permissions")
+                queue_webhook_log(message, "Missing permissions")
                 break
             except Exception as e:
                 logger.error(f"Unexpected error sending message: {e}")
-                await webhook_log(message, str(e))
+                queue_webhook_log(message, str(e))
                 break
         
         return response
         
     except Exception as e:
         logger.error(f"Error in generate_response_and_reply: {e}")
-        await webhook_log(message, str(e))
+        queue_webhook_log(message, str(e))
 
 @bot.event
 async def on_message(message: discord.Message):
@@ -1022,95 +1126,110 @@ async def on_message(message: discord.Message):
         ):
             return
         
-        # Add to message queue for processing
-        if channel_id not in bot.state.message_queues:
-            bot.state.message_queues[channel_id] = deque()
-            bot.state.processing_locks[channel_id] = Lock()
+        # Add to the channel's queue, starting its worker on first use
+        queue = bot.state.channel_queues.get(channel_id)
+        if queue is None:
+            queue = bot.state.channel_queues[channel_id] = asyncio.Queue()
+            bot.loop.create_task(channel_worker(channel_id, queue))
         
-        bot.state.message_queues[channel_id].append(message)
-        
-        # Process queue if not already processing
-        if not bot.state.processing_locks[channel_id].locked():
-            asyncio.create_task(process_message_queue(channel_id))
+        queue.put_nowait(message)
             
     except Exception as e:
         logger.error(f"Error in on_message: {e}")
 
-async def process_message_queue(channel_id: int):
-    """Enhanced message queue processing with batching support"""
-    async with bot.state.processing_locks[channel_id]:
-        while bot.state.message_queues[channel_id]:
-            message = bot.state.message_queues[channel_id].popleft()
-            batch_key = f"{message.author.id}-{channel_id}"
-            current_time = time.time()
-            
+async def channel_worker(channel_id: int, queue: asyncio.Queue):
+    """Long-lived consumer that drains a channel's message queue with batching support"""
+    backlog = deque()  # Messages pulled off the queue while batching but not yet handled
+    
+    while True:
+        if backlog:
+            message = backlog.popleft()
+        else:
             try:
-                if bot.state.batch_messages:
-                    # Initialize batch if not exists
-                    if batch_key not in bot.state.user_message_batches:
-                        first_image_url = (
-                            message.attachments[0].url if message.attachments else None
-                        )
-                        bot.state.user_message_batches[batch_key] = {
-                            "messages": [],
-                            "last_time": current_time,
-                            "image_url": first_image_url,
-                        }
-                    
-                    batch = bot.state.user_message_batches[batch_key]
-                    batch["messages"].append(message)
-                    
-                    # Wait for additional messages
-                    await asyncio.sleep(bot.state.batch_wait_time)
-                    
-                    # Collect additional messages from same user
-                    while bot.state.message_queues[channel_id]:
-                        next_message = bot.state.message_queues[channel_id][0]
-                        if (
-                            next_message.author.id == message.author.id
-                            and not next_message.content.startswith(PREFIX)
-                        ):
-                            next_message = bot.state.message_queues[channel_id].popleft()
-                            # Avoid duplicates
-                            if next_message.content not in [m.content for m in batch["messages"]]:
-                                batch["messages"].append(next_message)
-                            
-                            # Update image if not already set
-                            if not batch["image_url"] and next_message.attachments:
-                                batch["image_url"] = next_message.attachments[0].url
-                        else:
-                            break
-                    
-                    # Process batched messages
-                    messages_to_process = batch["messages"]
-                    combined_content = " | ".join([msg.content for msg in messages_to_process])
-                    
-                    # Get conversation history
-                    history = bot.state.message_history.get(message.author.id, [])
-                    
-                    # Update history with new content
-                    update_message_history(message.author.id, combined_content)
-                    
-                    # Generate and send response
-                    await generate_response_and_reply(
-                        message, combined_content, history, batch["image_url"]
+                message = await asyncio.wait_for(queue.get(), timeout=CHANNEL_WORKER_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                if not queue.empty():
+                    continue
+                # Idle for too long - retire this worker until the channel is active again
+                if bot.state.channel_queues.get(channel_id) is queue:
+                    del bot.state.channel_queues[channel_id]
+                return
+            queue.task_done()
+        
+        batch_key = f"{message.author.id}-{channel_id}"
+        current_time = time.monotonic()
+        
+        try:
+            if bot.state.batch_messages:
+                # Initialize batch if not exists
+                if batch_key not in bot.state.user_message_batches:
+                    first_image_url = (
+                        message.attachments[0].url if message.attachments else None
                     )
-                    
-                    # Clean up batch
-                    if batch_key in bot.state.user_message_batches:
-                        del bot.state.user_message_batches[batch_key]
+                    bot.state.user_message_batches[batch_key] = {
+                        "messages": [],
+                        "last_time": current_time,
+                        "image_url": first_image_url,
+                    }
                 
-                else:
-                    # Process single message
-                    history = bot.state.message_history.get(message.author.id, [])
-                    update_message_history(message.author.id, message.content)
-                    
-                    image_url = message.attachments[0].url if message.attachments else None
-                    await generate_response_and_reply(message, message.content, history, image_url)
+                batch = bot.state.user_message_batches[batch_key]
+                batch["messages"].append(message)
                 
-            except Exception as e:
-                logger.error(f"Error processing message in queue: {e}")
-                await webhook_log(message, str(e))
+                # Wait for additional messages
+                await asyncio.sleep(bot.state.batch_wait_time)
+                
+                while not queue.empty():
+                    backlog.append(queue.get_nowait())
+                    queue.task_done()
+                
+                # Collect additional messages from same user
+                while backlog:
+                    next_message = backlog[0]
+                    if (
+                        next_message.author.id == message.author.id
+                        and not next_message.content.startswith(PREFIX)
+                    ):
+                        next_message = backlog.popleft()
+                        # Avoid duplicates
+                        if next_message.content not in [m.content for m in batch["messages"]]:
+                            batch["messages"].append(next_message)
+                        
+                        # Update image if not already set
+                        if not batch["image_url"] and next_message.attachments:
+                            batch["image_url"] = next_message.attachments[0].url
+                    else:
+                        break
+                
+                # Process batched messages
+                messages_to_process = batch["messages"]
+                combined_content = " | ".join([msg.content for msg in messages_to_process])
+                
+                # Snapshot conversation history, then record the new content
+                author_history = get_author_history(message.author.id)
+                history = list(author_history)
+                _append_history(author_history, combined_content)
+                
+                # Generate and send response
+                await generate_response_and_reply(
+                    message, combined_content, history, batch["image_url"]
+                )
+                
+                # Clean up batch
+                if batch_key in bot.state.user_message_batches:
+                    del bot.state.user_message_batches[batch_key]
+            
+            else:
+                # Process single message
+                author_history = get_author_history(message.author.id)
+                history = list(author_history)
+                _append_history(author_history, message.content)
+                
+                image_url = message.attachments[0].url if message.attachments else None
+                await generate_response_and_reply(message, message.content, history, image_url)
+            
+        except Exception as e:
+            logger.error(f"Error processing message in queue: {e}")
+            queue_webhook_log(message, str(e))
 
 @bot.event
 async def on_error(event: str, *args, **kwargs):
@@ -1172,11 +1291,23 @@ def main():
         logger.info("Starting Discord AI Selfbot with ULTRA-ROBUST keep-alive...")
         print(f"{Fore.GREEN}🚀 Token validation passed, connecting to Discord with 24/7 mode...{Style.RESET_ALL}")
         
+        # Run the bot's event loop (and the health server on it) on uvloop when
+        # it is installed; bot.run creates its loop through the policy
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logger.info("Using uvloop event loop")
+        except ImportError:
+            pass
+        
         # Main bot loop with auto-restart capability
         max_restarts = 10
         restart_count = 0
         
+        backoff = RESTART_BACKOFF_BASE
+        
         while restart_count < max_restarts and keep_alive_state.running:
+            run_started = time.monotonic()
             try:
                 bot.run(TOKEN, log_handler=None)  # Disable discord.py's default logging
                 
@@ -1185,8 +1316,6 @@ def main():
                     restart_count += 1
                     logger.info(f"Bot restart requested ({restart_count}/{max_restarts})")
                     keep_alive_state.restart_requested = False
-                    time.sleep(5)  # Brief pause before restart
-                    continue
                 else:
                     break
                     
@@ -1197,11 +1326,16 @@ def main():
             except Exception as e:
                 restart_count += 1
                 logger.error(f"Bot crashed ({restart_count}/{max_restarts}): {e}")
-                if restart_count < max_restarts:
-                    time.sleep(10)  # Wait before restart
-                    continue
-                else:
+                if restart_count >= max_restarts:
                     break
+            
+            # Exponential backoff with jitter, reset after a long healthy run
+            if time.monotonic() - run_started > RESTART_STABLE_RUNTIME:
+                backoff = RESTART_BACKOFF_BASE
+            delay = min(backoff, RESTART_BACKOFF_MAX) + random.uniform(0, 1)
+            logger.info(f"Restarting in {delay:.1f}s")
+            time.sleep(delay)
+            backoff *= 2
         
         if restart_count >= max_restarts:
             logger.error("Maximum restart attempts reached")
@@ -1214,14 +1348,9 @@ def main():
         print(f"{Fore.RED}Critical error: {e}{Style.RESET_ALL}")
     finally:
         # Cleanup
+        # Loop-bound resources were released by bot.close() on the bot's loop
         keep_alive_state.running = False
-        try:
-            import asyncio
-            loop = asyncio.get_event_loop()
-            if not loop.is_closed():
-                loop.run_until_complete(stop_health_server())
-        except Exception:
-            pass
+        get_auth_manager().flush_now()
         
         logger.info("🔥 ULTRA-ROBUST 24/7 system shutdown complete")
 
@@ -8,6 +8,12 @@ import os
 import yaml
 from pathlib import Path
 
+# Prefer the libyaml-backed dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
 def create_default_config():
     """Create default configuration files"""
     
@@ -85,7 +91,7 @@ def create_default_config():
     # Save config.yaml
     config_path = config_dir / "config.yaml"
     with open(config_path, 'w', encoding='utf-8') as f:
-        yaml.dump(config, f, default_flow_style=False, indent=2)
+        yaml.dump(config, f, Dumper=SafeDumper, default_flow_style=False, indent=2)
     
     print(f"✓ Created default config.yaml")
     
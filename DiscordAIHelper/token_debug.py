@@ -9,11 +9,36 @@ import asyncio
 import aiohttp
 import base64
 import json
+from typing import List, Optional, Tuple
 from dotenv import load_dotenv
 from colorama import init, Fore, Style
 
 init(autoreset=True)
 
+# Characters that must never appear in a pasted token
+_NEWLINE_CHARS = frozenset("\r\n")
+_BAD_CHARS = frozenset(" \t") | _NEWLINE_CHARS
+
+# Shared HTTP session so repeated checks reuse the keep-alive connection
+_session: Optional[aiohttp.ClientSession] = None
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Get the shared aiohttp session, creating it on first use"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300, keepalive_timeout=75),
+            timeout=aiohttp.ClientTimeout(total=15)
+        )
+    return _session
+
+async def _close_session():
+    """Close the shared aiohttp session if it was opened"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
 async def test_token_api_direct():
     """Test token by calling Discord API directly"""
     load_dotenv("config/.env")
@@ -34,55 +59,55 @@ async def test_token_api_direct():
         "User-Agent": "DiscordBot (https://discord.com, 1.0)"
     }
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            # Try to get user info
-            async with session.get("https://discord.com/api/v10/users/@me", headers=headers) as resp:
-                if resp.status == 200:
-                    user_data = await resp.json()
-                    print(f"{Fore.GREEN}✓ Token is valid!{Style.RESET_ALL}")
-                    print(f"User: {user_data.get('username')}#{user_data.get('discriminator')}")
-                    print(f"ID: {user_data.get('id')}")
-                    print(f"Verified: {user_data.get('verified', 'Unknown')}")
-                    return True
-                elif resp.status == 401:
-                    error_data = await resp.json()
-                    print(f"{Fore.RED}✗ Token invalid: {error_data.get('message', 'Unauthorized')}{Style.RESET_ALL}")
-                    
-                    # Analyze token format
-                    if token.count('.') >= 2:
-                        parts = token.split('.')
-                        print(f"\n{Fore.YELLOW}Token analysis:{Style.RESET_ALL}")
-                        print(f"- Part 1 (User ID): {parts[0]} ({len(parts[0])} chars)")
-                        try:
-                            # Decode user ID from token
-                            user_id_encoded = parts[0]
-                            # Add padding if needed
-                            missing_padding = len(user_id_encoded) % 4
-                            if missing_padding:
-                                user_id_encoded += '=' * (4 - missing_padding)
-                            user_id = base64.b64decode(user_id_encoded).decode('utf-8')
-                            print(f"- Decoded User ID: {user_id}")
-                        except Exception as e:
-                            print(f"- Could not decode User ID: {e}")
-                    
-                    return False
-                else:
-                    print(f"{Fore.RED}✗ Unexpected status: {resp.status}{Style.RESET_ALL}")
-                    return False
-                    
-        except Exception as e:
-            print(f"{Fore.RED}✗ Connection error: {e}{Style.RESET_ALL}")
-            return False
+    session = await _get_session()
+    try:
+        # Try to get user info
+        async with session.get("https://discord.com/api/v10/users/@me", headers=headers) as resp:
+            if resp.status == 200:
+                user_data = await resp.json()
+                print(f"{Fore.GREEN}✓ Token is valid!{Style.RESET_ALL}")
+                print(f"User: {user_data.get('username')}#{user_data.get('discriminator')}")
+                print(f"ID: {user_data.get('id')}")
+                print(f"Verified: {user_data.get('verified', 'Unknown')}")
+                return True
+            elif resp.status == 401:
+                error_data = await resp.json()
+                print(f"{Fore.RED}✗ Token invalid: {error_data.get('message', 'Unauthorized')}{Style.RESET_ALL}")
+                
+                # Analyze token format
+                if token.count('.') >= 2:
+                    parts = token.split('.')
+                    print(f"\n{Fore.YELLOW}Token analysis:{Style.RESET_ALL}")
+                    print(f"- Part 1 (User ID): {parts[0]} ({len(parts[0])} chars)")
+                    try:
+                        # Decode user ID from token (URL-safe base64, padding restored)
+                        user_id = base64.urlsafe_b64decode(parts[0] + '=' * (-len(parts[0]) % 4)).decode('ascii')
+                        print(f"- Decoded User ID: {user_id}")
+                    except Exception as e:
+                        print(f"- Could not decode User ID: {e}")
+                
+                return False
+            else:
+                print(f"{Fore.RED}✗ Unexpected status: {resp.status}{Style.RESET_ALL}")
+                return False
+                
+    except Exception as e:
+        print(f"{Fore.RED}✗ Connection error: {e}{Style.RESET_ALL}")
+        return False
 
-def analyze_token_format(token):
-    """Analyze token format and provide feedback"""
+def analyze_token_format(token) -> Tuple[bool, List[str]]:
+    """Analyze token format and provide feedback
+    
+    Returns:
+        (ok, issues) where issues lists the problems that were found
+    """
     print(f"\n{Fore.CYAN}Token Format Analysis:{Style.RESET_ALL}")
+    n, dots = len(token), token.count('.')
     
     # Check basic format
-    if len(token) < 50:
+    if n < 50:
         print(f"{Fore.RED}✗ Token too short (needs 50+ characters){Style.RESET_ALL}")
-        return False
+        return False, ["Token too short"]
     
     # Check for common issues
     issues = []
@@ -90,24 +115,27 @@ def analyze_token_format(token):
         issues.append("Remove 'Bearer ' prefix")
     if token.startswith('"') and token.endswith('"'):
         issues.append("Remove quotes around token")
-    if ' ' in token:
+    bad_chars = _BAD_CHARS.intersection(token)  # Single scan for all whitespace checks
+    if ' ' in bad_chars:
         issues.append("Remove spaces in token")
-    if '\n' in token or '\r' in token:
+    if '\t' in bad_chars:
+        issues.append("Remove tabs in token")
+    if bad_chars & _NEWLINE_CHARS:
         issues.append("Remove newlines in token")
     
     if issues:
         print(f"{Fore.YELLOW}Found issues:{Style.RESET_ALL}")
         for issue in issues:
             print(f"- {issue}")
-        return False
+        return False, issues
     
     # Check if it looks like a valid Discord token
-    if token.count('.') >= 2:
+    if dots >= 2:
         print(f"{Fore.GREEN}✓ Token has proper structure (3 parts){Style.RESET_ALL}")
-    elif len(token) >= 70:
+    elif n >= 70:
         print(f"{Fore.GREEN}✓ Token length looks correct{Style.RESET_ALL}")
     
-    return True
+    return True, issues
 
 async def main():
     """Main testing function"""
@@ -122,7 +150,7 @@ async def main():
         return
     
     # Analyze format first
-    format_ok = analyze_token_format(token)
+    format_ok, _ = analyze_token_format(token)
     
     if format_ok:
         # Test with API
@@ -136,5 +164,12 @@ async def main():
     else:
         print(f"\n{Fore.RED}Fix token format issues first.{Style.RESET_ALL}")
 
+async def run():
+    """Run the debugger and release the shared HTTP session"""
+    try:
+        await main()
+    finally:
+        await _close_session()
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(run())
\ No newline at end of file
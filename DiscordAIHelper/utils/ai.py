@@ -5,17 +5,34 @@ Enhanced with 2025 Groq API and OpenAI support, improved error handling
 
 import os
 import asyncio
+import hashlib
 import json
 import logging
+import re
 import time
 import random
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple
 import httpx
-from groq import Groq
-from openai import OpenAI
+import groq
+import openai
+from groq import AsyncGroq
+from openai import AsyncOpenAI
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx when installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 from .helpers import load_config, load_instructions
-from .db import log_conversation, log_error
+from .db import log_error
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +41,32 @@ groq_client = None
 openai_client = None
 config = None
 
+# HTTP connection pool shared by both SDK clients
+http_client: Optional[httpx.AsyncClient] = None
+
+# Per-provider model and sampling parameters, resolved once in init_ai
+completion_params: Dict[str, Dict[str, Any]] = {}
+
+# Initialized providers in fallback order (Groq first for speed and cost), set in init_ai
+provider_order: Tuple[str, ...] = ()
+
 # Rate limiting and retry settings
 RATE_LIMIT_DELAY = 1.0
 MAX_RETRIES = 3
 REQUEST_TIMEOUT = 30.0
+RETRY_DEADLINE = REQUEST_TIMEOUT * 1.5  # Total time allowed across all retry attempts
+MAX_BACKOFF = 30.0  # Cap on exponential backoff when the server gives no reset hint
+
+# SDK exception groups used by the retry loops
+SDK_RATE_LIMIT_ERRORS = (groq.RateLimitError, openai.RateLimitError)
+SDK_TRANSIENT_ERRORS = (groq.APIConnectionError, openai.APIConnectionError, httpx.TransportError)
+
+# Roles alternate through the history window, starting with the user
+HISTORY_ROLES = ("user", "assistant")
+
+# Keyword fallback for sentiment analysis (whole words, case-insensitive)
+POSITIVE_WORDS_RE = re.compile(r"\b(?:good|great|awesome|love|like|happy|excellent|amazing)\b", re.IGNORECASE)
+NEGATIVE_WORDS_RE = re.compile(r"\b(?:bad|hate|terrible|awful|sad|angry|horrible|disgusting)\b", re.IGNORECASE)
 
 class AIError(Exception):
     """Custom exception for AI-related errors"""
@@ -37,17 +76,74 @@ class RateLimitError(AIError):
     """Exception for rate limit errors"""
     pass
 
+def _rate_limit_wait(error: Exception, attempt: int) -> float:
+    """Seconds to wait after a rate limit, preferring the server's advertised reset window"""
+    headers = error.response.headers
+    retry_after = headers.get("retry-after") or headers.get("x-ratelimit-reset-after")
+    try:
+        return float(retry_after) + random.random() * 0.1
+    except (TypeError, ValueError):
+        return min(MAX_BACKOFF, (2 ** attempt) + random.random())
+
+def _build_completion_params(settings_key: str, model_key: str, default_model: str) -> Dict[str, Any]:
+    """Resolve model and sampling parameters for a provider from the loaded config"""
+    ai_config = config.get("ai", {})
+    ai_settings = ai_config.get(settings_key, {})
+    return {
+        "model": config.get("bot", {}).get(model_key, default_model),
+        "max_tokens": ai_settings.get("max_tokens", 1024),
+        "temperature": ai_config.get("temperature", 0.7),
+        "top_p": ai_settings.get("top_p", 0.9),
+        "frequency_penalty": ai_settings.get("frequency_penalty", 0.0),
+        "presence_penalty": ai_settings.get("presence_penalty", 0.0)
+    }
+
+def _history_messages(history: List[str], limit: int) -> List[Dict[str, str]]:
+    """Build chat messages for the last `limit` history entries without copying the list"""
+    start = max(0, len(history) - limit)
+    return [
+        {"role": HISTORY_ROLES[i & 1], "content": history[start + i]}
+        for i in range(len(history) - start)
+    ]
+
+@lru_cache(maxsize=8)
+def _prompt_cache_key(instructions: str) -> str:
+    """Stable key that routes requests sharing a system prompt to the same prompt cache"""
+    return hashlib.sha256(instructions.encode("utf-8")).hexdigest()[:32]
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the keep-alive HTTP client shared by the Groq and OpenAI SDKs"""
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=REQUEST_TIMEOUT
+        )
+    return http_client
+
+async def close_ai():
+    """Close the shared HTTP client on shutdown"""
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
 def init_ai():
     """Initialize AI clients with API keys"""
-    global groq_client, openai_client, config
+    global groq_client, openai_client, config, provider_order
     
     config = load_config()
+    completion_params["groq"] = _build_completion_params("groq_settings", "groq_model", "llama-3.3-70b-versatile")
+    # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
+    # do not change this unless explicitly requested by the user
+    completion_params["openai"] = _build_completion_params("openai_settings", "openai_model", "gpt-4o")
     
     # Initialize Groq client
     groq_api_key = os.getenv("GROQ_API_KEY")
     if groq_api_key:
         try:
-            groq_client = Groq(api_key=groq_api_key)
+            groq_client = AsyncGroq(api_key=groq_api_key, http_client=_get_http_client())
             logger.info("Groq client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Groq client: {e}")
@@ -58,19 +154,28 @@ def init_ai():
         try:
             # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
             # do not change this unless explicitly requested by the user
-            openai_client = OpenAI(api_key=openai_api_key)
+            openai_client = AsyncOpenAI(api_key=openai_api_key, http_client=_get_http_client())
             logger.info("OpenAI client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI client: {e}")
     
-    if not groq_client and not openai_client:
+    provider_order = tuple(name for name, client in (("groq", groq_client), ("openai", openai_client)) if client)
+    if not provider_order:
         logger.warning("No AI clients initialized. Please check your API keys.")
 
-async def generate_response_groq(prompt: str, instructions: str, history: List[str] = None) -> Optional[str]:
-    """Generate response using Groq API with enhanced error handling"""
-    if not groq_client:
-        raise AIError("Groq client not initialized")
+async def _chat_completion(client, provider: str, name: str, prompt: str, instructions: str,
+                           history: List[str] = None) -> Optional[str]:
+    """Generate a chat completion with retry logic, shared by all providers
+    
+    Args:
+        client: Initialized async SDK client for the provider
+        provider: Key into completion_params ("groq" or "openai")
+        name: Display name used in log messages
     
+    The instructions are always sent as the first (system) message so the
+    providers can reuse their cached prompt prefix. Callers must not template
+    per-request values (timestamps, user IDs) into the instructions.
+    """
     try:
         # Prepare messages
         messages = [
@@ -79,156 +184,97 @@ async def generate_response_groq(prompt: str, instructions: str, history: List[s
         
         # Add conversation history
         if history:
-            for i, msg in enumerate(history[-10:]):  # Limit history to last 10 messages
-                role = "assistant" if i % 2 == 1 else "user"
-                messages.append({"role": role, "content": msg})
+            messages.extend(_history_messages(history, 10))  # Limit history to last 10 messages
         
         # Add current prompt
         messages.append({"role": "user", "content": prompt})
         
-        # Get AI settings from config
-        ai_settings = config.get("ai", {}).get("groq_settings", {})
-        model = config.get("bot", {}).get("groq_model", "llama-3.3-70b-versatile")
+        # Request parameters are identical across retry attempts
+        completion_kwargs = {**completion_params[provider], "messages": messages}
+        if provider == "openai":
+            completion_kwargs["extra_body"] = {"prompt_cache_key": _prompt_cache_key(instructions)}
         
-        # Make API request with retry logic
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = await asyncio.to_thread(
-                    groq_client.chat.completions.create,
-                    model=model,
-                    messages=messages,
-                    max_tokens=ai_settings.get("max_tokens", 1024),
-                    temperature=config.get("ai", {}).get("temperature", 0.7),
-                    top_p=ai_settings.get("top_p", 0.9),
-                    frequency_penalty=ai_settings.get("frequency_penalty", 0.0),
-                    presence_penalty=ai_settings.get("presence_penalty", 0.0)
-                )
-                
-                if response.choices and response.choices[0].message:
-                    content = response.choices[0].message.content.strip()
-                    
-                    # Log token usage
-                    usage = getattr(response, 'usage', None)
-                    tokens_used = usage.total_tokens if usage else 0
-                    logger.info(f"Groq response generated using {tokens_used} tokens")
+        # Make API request with retry logic, bounded by one deadline for all attempts
+        try:
+            async with asyncio.timeout(RETRY_DEADLINE):
+                for attempt in range(MAX_RETRIES):
+                    try:
+                        response = await client.chat.completions.create(**completion_kwargs)
+                        
+                        if response.choices and response.choices[0].message:
+                            content = response.choices[0].message.content.strip()
+                            
+                            # Log token usage
+                            usage = response.usage
+                            tokens_used = usage.total_tokens if usage else 0
+                            logger.info("%s response generated using %s tokens", name, tokens_used)
+                            
+                            return content
+                        else:
+                            logger.warning("Empty response from %s API", name)
+                            return None
+                        
+                    except SDK_RATE_LIMIT_ERRORS as e:
+                        if attempt == MAX_RETRIES - 1:
+                            raise RateLimitError("Rate limit exceeded after all retries")
+                        
+                        wait_time = _rate_limit_wait(e, attempt)
+                        logger.warning("Rate limit hit, waiting %.2fs (attempt %d)", wait_time, attempt + 1)
+                        await asyncio.sleep(wait_time)
                     
-                    return content
-                else:
-                    logger.warning("Empty response from Groq API")
-                    return None
-                
-            except Exception as e:
-                error_msg = str(e).lower()
-                
-                if "rate limit" in error_msg or "quota" in error_msg:
-                    wait_time = (2 ** attempt) + random.uniform(0, 1)
-                    logger.warning(f"Rate limit hit, waiting {wait_time:.2f}s (attempt {attempt + 1})")
-                    await asyncio.sleep(wait_time)
+                    except SDK_TRANSIENT_ERRORS as e:
+                        if attempt == MAX_RETRIES - 1:
+                            logger.error("%s connection error after %d attempts: %s", name, MAX_RETRIES, e)
+                            raise AIError(f"{name} connection error: {e}")
+                        
+                        logger.warning("%s connection error (attempt %d): %s", name, attempt + 1, e)
+                        await asyncio.sleep(1.0)
                     
-                    if attempt == MAX_RETRIES - 1:
-                        raise RateLimitError("Rate limit exceeded after all retries")
-                    continue
-                
-                elif attempt == MAX_RETRIES - 1:
-                    logger.error(f"Groq API error after {MAX_RETRIES} attempts: {e}")
-                    raise AIError(f"Groq API error: {e}")
-                else:
-                    logger.warning(f"Groq API error (attempt {attempt + 1}): {e}")
-                    await asyncio.sleep(1.0)
+                    except Exception as e:
+                        if attempt == MAX_RETRIES - 1:
+                            logger.error("%s API error after %d attempts: %s", name, MAX_RETRIES, e)
+                            raise AIError(f"{name} API error: {e}")
+                        
+                        logger.warning("%s API error (attempt %d): %s", name, attempt + 1, e)
+                        await asyncio.sleep(1.0)
+        except TimeoutError:
+            logger.warning("%s request timed out after %.0fs", name, RETRY_DEADLINE)
+            return None
         
         return None
         
     except Exception as e:
-        logger.error(f"Error in generate_response_groq: {e}")
-        log_error("groq_api_error", str(e))
+        logger.error("Error in generate_response_%s: %s", provider, e)
+        log_error(f"{provider}_api_error", str(e))
         raise
 
+async def generate_response_groq(prompt: str, instructions: str, history: List[str] = None) -> Optional[str]:
+    """Generate response using Groq API with enhanced error handling"""
+    if not groq_client:
+        raise AIError("Groq client not initialized")
+    
+    return await _chat_completion(groq_client, "groq", "Groq", prompt, instructions, history)
+
 async def generate_response_openai(prompt: str, instructions: str, history: List[str] = None) -> Optional[str]:
     """Generate response using OpenAI API with enhanced error handling"""
     if not openai_client:
         raise AIError("OpenAI client not initialized")
     
-    try:
-        # Prepare messages
-        messages = [
-            {"role": "system", "content": instructions}
-        ]
-        
-        # Add conversation history
-        if history:
-            for i, msg in enumerate(history[-10:]):  # Limit history to last 10 messages
-                role = "assistant" if i % 2 == 1 else "user"
-                messages.append({"role": role, "content": msg})
-        
-        # Add current prompt
-        messages.append({"role": "user", "content": prompt})
-        
-        # Get AI settings from config
-        ai_settings = config.get("ai", {}).get("openai_settings", {})
-        # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-        # do not change this unless explicitly requested by the user
-        model = config.get("bot", {}).get("openai_model", "gpt-4o")
-        
-        # Make API request with retry logic
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = await asyncio.to_thread(
-                    openai_client.chat.completions.create,
-                    model=model,
-                    messages=messages,
-                    max_tokens=ai_settings.get("max_tokens", 1024),
-                    temperature=config.get("ai", {}).get("temperature", 0.7),
-                    top_p=ai_settings.get("top_p", 0.9),
-                    frequency_penalty=ai_settings.get("frequency_penalty", 0.0),
-                    presence_penalty=ai_settings.get("presence_penalty", 0.0)
-                )
-                
-                if response.choices and response.choices[0].message:
-                    content = response.choices[0].message.content.strip()
-                    
-                    # Log token usage
-                    usage = getattr(response, 'usage', None)
-                    tokens_used = usage.total_tokens if usage else 0
-                    logger.info(f"OpenAI response generated using {tokens_used} tokens")
-                    
-                    return content
-                else:
-                    logger.warning("Empty response from OpenAI API")
-                    return None
-                
-            except Exception as e:
-                error_msg = str(e).lower()
-                
-                if "rate limit" in error_msg or "quota" in error_msg:
-                    wait_time = (2 ** attempt) + random.uniform(0, 1)
-                    logger.warning(f"Rate limit hit, waiting {wait_time:.2f}s (attempt {attempt + 1})")
-                    await asyncio.sleep(wait_time)
-                    
-                    if attempt == MAX_RETRIES - 1:
-                        raise RateLimitError("Rate limit exceeded after all retries")
-                    continue
-                
-                elif attempt == MAX_RETRIES - 1:
-                    logger.error(f"OpenAI API error after {MAX_RETRIES} attempts: {e}")
-                    raise AIError(f"OpenAI API error: {e}")
-                else:
-                    logger.warning(f"OpenAI API error (attempt {attempt + 1}): {e}")
-                    await asyncio.sleep(1.0)
-        
-        return None
-        
-    except Exception as e:
-        logger.error(f"Error in generate_response_openai: {e}")
-        log_error("openai_api_error", str(e))
-        raise
+    return await _chat_completion(openai_client, "openai", "OpenAI", prompt, instructions, history)
+
+# Display name and text generator for each provider key
+PROVIDER_GENERATORS = {
+    "groq": ("Groq", generate_response_groq),
+    "openai": ("OpenAI", generate_response_openai)
+}
 
 async def generate_response(prompt: str, instructions: str, history: List[str] = None) -> Optional[str]:
     """Generate AI response using available providers with fallback"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        # Validate input
-        if not prompt or not prompt.strip():
+        # Validate input; only short prompts are worth stripping to detect blank input
+        if not prompt or (len(prompt) < 256 and not prompt.strip()):
             logger.warning("Empty prompt provided")
             return None
         
@@ -236,41 +282,30 @@ async def generate_response(prompt: str, instructions: str, history: List[str] =
             logger.warning("Prompt too long, truncating")
             prompt = prompt[:4000]
         
-        # Try Groq first (recommended for speed and cost)
-        if groq_client:
+        # Try each initialized provider in order, falling back on failure
+        for provider in provider_order:
+            name, generate = PROVIDER_GENERATORS[provider]
             try:
-                response = await generate_response_groq(prompt, instructions, history)
+                response = await generate(prompt, instructions, history)
                 if response:
-                    response_time = time.time() - start_time
-                    logger.info(f"Groq response generated in {response_time:.2f}s")
+                    logger.debug("%s response generated in %.2fs", name, time.perf_counter() - start_time)
                     return response
             except RateLimitError:
-                logger.warning("Groq rate limit hit, trying OpenAI fallback")
-            except AIError as e:
-                logger.warning(f"Groq error, trying OpenAI fallback: {e}")
-        
-        # Fallback to OpenAI
-        if openai_client:
-            try:
-                response = await generate_response_openai(prompt, instructions, history)
-                if response:
-                    response_time = time.time() - start_time
-                    logger.info(f"OpenAI response generated in {response_time:.2f}s")
-                    return response
+                logger.warning("%s rate limit hit, trying next provider", name)
             except Exception as e:
-                logger.error(f"OpenAI fallback failed: {e}")
+                logger.warning("%s error, trying next provider: %s", name, e)
         
         logger.error("All AI providers failed or unavailable")
         return "I'm having trouble connecting to AI services right now. Please try again later."
         
     except Exception as e:
-        logger.error(f"Error in generate_response: {e}")
+        logger.error("Error in generate_response: %s", e)
         log_error("ai_generation_error", str(e))
         return "Sorry, I encountered an error while processing your request."
 
 async def generate_response_image(prompt: str, instructions: str, image_url: str, history: List[str] = None) -> Optional[str]:
     """Generate AI response for image with text using vision models"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         # For now, prioritize OpenAI for image analysis as it has better vision capabilities
@@ -285,9 +320,7 @@ async def generate_response_image(prompt: str, instructions: str, image_url: str
                 
                 # Add conversation history (text only)
                 if history:
-                    for i, msg in enumerate(history[-5:]):  # Reduced for image context
-                        role = "assistant" if i % 2 == 1 else "user"
-                        messages.append({"role": role, "content": msg})
+                    messages.extend(_history_messages(history, 5))  # Reduced for image context
                 
                 # Add current prompt with image
                 user_content = [
@@ -298,27 +331,28 @@ async def generate_response_image(prompt: str, instructions: str, image_url: str
                 
                 ai_settings = config.get("ai", {}).get("openai_settings", {})
                 
-                response = await asyncio.to_thread(
-                    openai_client.chat.completions.create,
-                    # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-                    # do not change this unless explicitly requested by the user
-                    model="gpt-4o",  # Use vision-capable model
-                    messages=messages,
-                    max_tokens=ai_settings.get("max_tokens", 1024),
-                    temperature=config.get("ai", {}).get("temperature", 0.7)
-                )
+                async with asyncio.timeout(RETRY_DEADLINE):
+                    response = await openai_client.chat.completions.create(
+                        # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
+                        # do not change this unless explicitly requested by the user
+                        model="gpt-4o",  # Use vision-capable model
+                        messages=messages,
+                        max_tokens=ai_settings.get("max_tokens", 1024),
+                        temperature=config.get("ai", {}).get("temperature", 0.7),
+                        extra_body={"prompt_cache_key": _prompt_cache_key(instructions)}
+                    )
                 
                 if response.choices and response.choices[0].message:
                     content = response.choices[0].message.content.strip()
-                    response_time = time.time() - start_time
                     
-                    tokens_used = getattr(response, 'usage', {}).get('total_tokens', 0)
-                    logger.info(f"OpenAI vision response generated in {response_time:.2f}s using {tokens_used} tokens")
+                    usage = response.usage
+                    tokens_used = usage.total_tokens if usage else 0
+                    logger.debug("OpenAI vision response generated in %.2fs using %s tokens", time.perf_counter() - start_time, tokens_used)
                     
                     return content
                 
             except Exception as e:
-                logger.error(f"OpenAI vision error: {e}")
+                logger.error("OpenAI vision error: %s", e)
         
         # Fallback: Try to use Groq with text-only prompt
         if groq_client:
@@ -326,16 +360,15 @@ async def generate_response_image(prompt: str, instructions: str, image_url: str
                 fallback_prompt = f"{prompt}\n\n[Note: An image was shared but I cannot analyze it. Please describe the image if you'd like me to comment on it.]"
                 response = await generate_response_groq(fallback_prompt, instructions, history)
                 if response:
-                    response_time = time.time() - start_time
-                    logger.info(f"Groq fallback response generated in {response_time:.2f}s")
+                    logger.debug("Groq fallback response generated in %.2fs", time.perf_counter() - start_time)
                     return response
             except Exception as e:
-                logger.error(f"Groq fallback error: {e}")
+                logger.error("Groq fallback error: %s", e)
         
         return "I can see you shared an image, but I'm having trouble analyzing it right now. Could you describe what's in the image?"
         
     except Exception as e:
-        logger.error(f"Error in generate_response_image: {e}")
+        logger.error("Error in generate_response_image: %s", e)
         log_error("ai_image_error", str(e))
         return "Sorry, I encountered an error while analyzing the image."
 
@@ -354,31 +387,27 @@ Respond with JSON in this format:
         
         if groq_client:
             try:
-                response = await asyncio.to_thread(
-                    groq_client.chat.completions.create,
+                response = await groq_client.chat.completions.create(
                     model=config.get("bot", {}).get("groq_model", "llama-3.3-70b-versatile"),
                     messages=[{"role": "user", "content": prompt}],
                     max_tokens=150,
-                    temperature=0.3
+                    temperature=0.3,
+                    response_format={"type": "json_object"}
                 )
                 
                 if response.choices and response.choices[0].message:
                     content = response.choices[0].message.content.strip()
                     try:
-                        result = json.loads(content)
+                        result = json_loads(content)
                         return result
-                    except json.JSONDecodeError:
+                    except ValueError:  # json and orjson decode errors both subclass ValueError
                         logger.warning("Failed to parse sentiment JSON from Groq")
             except Exception as e:
                 logger.error(f"Groq sentiment analysis error: {e}")
         
         # Fallback to simple keyword-based analysis
-        positive_words = ["good", "great", "awesome", "love", "like", "happy", "excellent", "amazing"]
-        negative_words = ["bad", "hate", "terrible", "awful", "sad", "angry", "horrible", "disgusting"]
-        
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        positive_count = len(POSITIVE_WORDS_RE.findall(text))
+        negative_count = len(NEGATIVE_WORDS_RE.findall(text))
         
         if positive_count > negative_count:
             return {"sentiment": "positive", "confidence": 0.6, "explanation": "Keyword-based analysis"}
@@ -398,7 +427,7 @@ async def get_available_models() -> Dict[str, List[str]]:
     # Get Groq models
     if groq_client:
         try:
-            groq_models = await asyncio.to_thread(groq_client.models.list)
+            groq_models = await groq_client.models.list()
             models["groq"] = [model.id for model in groq_models.data]
         except Exception as e:
             logger.error(f"Error getting Groq models: {e}")
@@ -406,7 +435,7 @@ async def get_available_models() -> Dict[str, List[str]]:
     # Get OpenAI models
     if openai_client:
         try:
-            openai_models = await asyncio.to_thread(openai_client.models.list)
+            openai_models = await openai_client.models.list()
             models["openai"] = [model.id for model in openai_models.data if "gpt" in model.id.lower()]
         except Exception as e:
             logger.error(f"Error getting OpenAI models: {e}")
@@ -426,8 +455,7 @@ def get_ai_status() -> Dict[str, Any]:
 async def generate_auto_conversation_starter(channel_context: str = None, recent_messages: List[str] = None) -> Optional[str]:
     """Generate a natural conversation starter for auto-initiated messages"""
     try:
-        config = load_config()
-        instructions = load_instructions()
+        instructions = load_instructions()  # Cached until the instructions file changes
         
         # Create context for auto conversation
         auto_prompt = f"""Generate a natural, casual conversation starter that feels like a real person randomly starting a chat. 
@@ -472,5 +500,5 @@ Generate ONE casual conversation starter:"""
         return None
         
     except Exception as e:
-        logger.error(f"Failed to generate auto conversation starter: {e}")
+        logger.error("Failed to generate auto conversation starter: %s", e)
         return None
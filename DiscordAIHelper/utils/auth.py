@@ -4,86 +4,209 @@ User authorization utilities for Discord AI Selfbot
 Manages authorized users and permission checking
 """
 
+import os
+import sys
+import asyncio
 import yaml
 import logging
-from typing import List, Set, Optional
+from typing import Any, Dict, FrozenSet, List, Set, Optional, Tuple
 from .helpers import resource_path
 
+# Prefer the libyaml-backed loader and dumper when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Prefer orjson for the JSON auth file, falling back to the standard library
+try:
+    import orjson
+    
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    import json
+    
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on memoized (user, command) permission decisions
+DECISION_CACHE_SIZE = 1024
+
+# Seconds to wait for further user changes before writing the auth file
+SAVE_DEBOUNCE_DELAY = 1.0
+
+# Seconds to wait before retrying a failed save of pending user changes
+SAVE_RETRY_DELAY = 30.0
+
+# Auth config files; the JSON file takes precedence and the YAML file is used
+# when no JSON file exists. Saves go back to whichever file was loaded, and
+# only a fresh install with neither file gets a new JSON file.
+AUTH_JSON_FILE = "config/authorized_users.json"
+AUTH_YAML_FILE = "config/authorized_users.yaml"
+
+# Parsed auth files keyed by path, with the mtime they were read at
+_auth_file_cache: Dict[str, Tuple[int, dict]] = {}
+
+def _read_auth_file(path: str) -> dict:
+    """Parse an auth JSON or YAML file, reusing the cached result while the file is unchanged"""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _auth_file_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    if path.endswith('.json'):
+        with open(path, 'rb') as f:
+            data = _json_loads(f.read()) or {}
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=SafeLoader) or {}
+    _auth_file_cache[path] = (mtime, data)
+    return data
+
+# Authorized set (shared, not copied) and owner ID of the loaded config, used
+# by the module-level quick checks to skip the manager lookup
+_auth_set: Set[int] = set()
+_owner_id: Optional[int] = None
+
+def _publish_auth_state(manager: "AuthManager"):
+    """Expose the manager's authorized set and owner ID to the quick checks"""
+    global _auth_set, _owner_id
+    _auth_set = manager.authorized_users
+    _owner_id = manager.owner_id
+
+def _write_auth_file(auth_file: str, config: dict):
+    """Write the auth config as JSON or YAML by extension, atomically replacing the previous file"""
+    if auth_file.endswith('.json'):
+        data = _json_dumps(config)
+    else:
+        data = yaml.dump(config, Dumper=SafeDumper, default_flow_style=False, indent=2).encode('utf-8')
+    
+    tmp_file = auth_file + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, auth_file)
+    _auth_file_cache.pop(auth_file, None)
+
 class AuthManager:
     """Manages authorized users and permissions"""
     
     def __init__(self):
+        # Kept as a hash set: even for a handful of IDs, `in` on a set beats a
+        # sorted array + bisect, which pays for a Python-level compare and box
         self.authorized_users: Set[int] = set()
+        # Immutable snapshot of authorized_users handed out to readers
+        self._authorized_users_view: FrozenSet[int] = frozenset()
         self.owner_id: Optional[int] = None
         self.allowed_commands: List[str] = []
         self.owner_only_commands: List[str] = []
+        # Allowed commands minus owner-only ones, for non-owner permission checks
+        self._non_owner_commands: FrozenSet[str] = frozenset()
+        # Memoized can_use_command results, cleared whenever permissions change
+        self._decision_cache: Dict[Tuple[int, str], bool] = {}
+        # Pending debounced save of user changes
+        self._dirty = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        # Whether the last write of pending user changes failed
+        self.save_failed = False
+        # Auth file locations, resolved once
+        self._json_file = resource_path(AUTH_JSON_FILE)
+        self._yaml_file = resource_path(AUTH_YAML_FILE)
+        # File the config was last loaded from, and that saves are written to
+        self.auth_file = self._json_file
         self.load_authorized_users()
     
+    def _rebuild_command_sets(self):
+        """Refresh the command lookup set from the command lists"""
+        self._non_owner_commands = frozenset(self.allowed_commands) - frozenset(self.owner_only_commands)
+        self._decision_cache.clear()
+    
     def load_authorized_users(self) -> bool:
         """Load authorized users from configuration file"""
+        # Write any debounced user changes first, so the reload neither drops
+        # them nor lets the pending save overwrite the reloaded config
+        self.flush_now()
+        
         try:
-            auth_file = resource_path("config/authorized_users.yaml")
-            
-            with open(auth_file, 'r', encoding='utf-8') as f:
-                auth_config = yaml.safe_load(f)
-            
-            # Load authorized user IDs
-            user_ids = auth_config.get('authorized_users', [])
-            self.authorized_users = {int(uid) for uid in user_ids if uid}
-            
-            # Load owner ID (first user in list is typically owner)
-            if user_ids:
-                self.owner_id = int(user_ids[0])
-            
-            # Load permission settings
-            permissions = auth_config.get('permissions', {})
-            self.allowed_commands = permissions.get('allowed_commands', [])
-            self.owner_only_commands = permissions.get('owner_only_commands', [])
+            if os.path.exists(self._json_file):
+                auth_file = self._json_file
+                if os.path.exists(self._yaml_file):
+                    logger.warning("Both %s and %s exist; using %s and ignoring the YAML file",
+                                   AUTH_JSON_FILE, AUTH_YAML_FILE, AUTH_JSON_FILE)
+            else:
+                auth_file = self._yaml_file
             
-            logger.info(f"Loaded {len(self.authorized_users)} authorized users: {list(self.authorized_users)}")
-            logger.info(f"Owner ID set to: {self.owner_id}")
-            logger.info(f"Allowed commands: {len(self.allowed_commands)}")
+            self._apply_config(_read_auth_file(auth_file))
+            self.auth_file = auth_file
+            logger.info("Loaded authorization config from %s", auth_file)
             return True
             
         except FileNotFoundError:
             logger.warning("Authorized users file not found, creating default")
-            self.create_default_auth_file()
-            return self.load_authorized_users()  # Try loading again after creation
+            self.auth_file = self._json_file
+            self._apply_config(self.create_default_auth_file())
+            return True
         except Exception as e:
             logger.error(f"Error loading authorized users: {e}")
             return False
     
-    def create_default_auth_file(self) -> bool:
-        """Create default authorized users file"""
-        try:
-            auth_file = resource_path("config/authorized_users.yaml")
-            
-            default_config = {
-                'authorized_users': [1007652090925043753],  # Your owner ID
-                'permissions': {
-                    'allowed_commands': [
-                        'help', 'stats', 'channels', 'toggleactive', 
-                        'ignore', 'unignore', 'toggledm', 'togglegc',
-                        'pause', 'resume', 'cleanup', 'system'
-                    ],
-                    'owner_only_commands': [
-                        'reload', 'restart', 'shutdown', 'maintenance',
-                        'config', 'prompt', 'testwh', 'logs'
-                    ]
-                }
+    def _apply_config(self, auth_config: dict):
+        """Set users and permissions from a parsed auth config"""
+        # Load authorized user IDs
+        user_ids = auth_config.get('authorized_users', [])
+        self.authorized_users = {int(uid) for uid in user_ids if uid}
+        
+        # Load owner ID (first user in list is typically owner)
+        if user_ids:
+            self.owner_id = int(user_ids[0])
+        
+        # Load permission settings
+        permissions = auth_config.get('permissions', {})
+        # Interned so lookups with the commands' own (interned) names hit by identity
+        self.allowed_commands = [sys.intern(str(c)) for c in permissions.get('allowed_commands', [])]
+        self.owner_only_commands = [sys.intern(str(c)) for c in permissions.get('owner_only_commands', [])]
+        self._rebuild_command_sets()
+        self._authorized_users_view = frozenset(self.authorized_users)
+        _publish_auth_state(self)
+        
+        logger.info("Loaded %d authorized users: %s", len(self.authorized_users), self.authorized_users)
+        logger.info("Owner ID set to: %s", self.owner_id)
+        logger.info("Allowed commands: %d", len(self.allowed_commands))
+    
+    def create_default_auth_file(self) -> dict:
+        """Create default authorized users file and return the default config"""
+        default_config = {
+            'authorized_users': [1007652090925043753],  # Your owner ID
+            'permissions': {
+                'allowed_commands': [
+                    'help', 'stats', 'channels', 'toggleactive', 
+                    'ignore', 'unignore', 'toggledm', 'togglegc',
+                    'pause', 'resume', 'cleanup', 'system'
+                ],
+                'owner_only_commands': [
+                    'reload', 'restart', 'shutdown', 'maintenance',
+                    'config', 'prompt', 'testwh', 'logs'
+                ]
             }
-            
-            with open(auth_file, 'w', encoding='utf-8') as f:
-                yaml.dump(default_config, f, default_flow_style=False, indent=2)
-            
+        }
+        
+        try:
+            _write_auth_file(self.auth_file, default_config)
             logger.info("Created default authorized users file")
-            return True
-            
         except Exception as e:
             logger.error(f"Error creating default auth file: {e}")
-            return False
+        
+        return default_config
     
     def is_authorized(self, user_id: int) -> bool:
         """Check if user is authorized to use bot commands"""
@@ -94,19 +217,29 @@ class AuthManager:
         return user_id == self.owner_id
     
     def can_use_command(self, user_id: int, command_name: str) -> bool:
-        """Check if user can use a specific command"""
+        """Check if user can use a specific command
+        
+        command_name should be interned (as discord.py command names declared
+        in code already are) so set lookups match by identity.
+        """
+        key = (user_id, command_name)
+        decision = self._decision_cache.get(key)
+        if decision is None:
+            if len(self._decision_cache) >= DECISION_CACHE_SIZE:
+                self._decision_cache.clear()
+            decision = self._decision_cache[key] = self._check_command(user_id, command_name)
+        return decision
+    
+    def _check_command(self, user_id: int, command_name: str) -> bool:
+        """Compute whether user can use a specific command"""
         if self.is_owner(user_id):
             return True
         
         if not self.is_authorized(user_id):
             return False
         
-        # Check if command is owner-only
-        if command_name in self.owner_only_commands:
-            return False
-        
-        # Check if command is in allowed list
-        return command_name in self.allowed_commands
+        # Check if command is allowed and not owner-only
+        return command_name in self._non_owner_commands
     
     def add_user(self, user_id: int) -> bool:
         """Add user to authorized list"""
@@ -115,7 +248,9 @@ class AuthManager:
                 return False  # Already authorized
             
             self.authorized_users.add(user_id)
-            return self.save_authorized_users()
+            self._authorized_users_view = frozenset(self.authorized_users)
+            self._decision_cache.clear()
+            return self._schedule_save()
             
         except Exception as e:
             logger.error(f"Error adding user {user_id}: {e}")
@@ -131,17 +266,56 @@ class AuthManager:
                 return False  # Not authorized
             
             self.authorized_users.remove(user_id)
-            return self.save_authorized_users()
+            self._authorized_users_view = frozenset(self.authorized_users)
+            self._decision_cache.clear()
+            return self._schedule_save()
             
         except Exception as e:
             logger.error(f"Error removing user {user_id}: {e}")
             return False
     
+    def _schedule_save(self) -> bool:
+        """Coalesce saves from a burst of user changes into a single write"""
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self.flush_now()  # No event loop to defer on, save now
+        
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        self._save_handle = loop.call_later(SAVE_DEBOUNCE_DELAY, self.flush_now)
+        return True
+    
+    def flush_now(self) -> bool:
+        """Write any pending user changes immediately"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        
+        if not self._dirty:
+            return True
+        
+        if self.save_authorized_users():
+            self._dirty = False
+            self.save_failed = False
+            return True
+        
+        # Keep the changes pending and retry later while the loop is running
+        self.save_failed = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.error("Failed to save authorized users; unsaved changes will be lost")
+            return False
+        
+        logger.error(f"Failed to save authorized users; retrying in {SAVE_RETRY_DELAY:.0f}s")
+        self._save_handle = loop.call_later(SAVE_RETRY_DELAY, self.flush_now)
+        return False
+    
     def save_authorized_users(self) -> bool:
         """Save authorized users to configuration file"""
         try:
-            auth_file = resource_path("config/authorized_users.yaml")
-            
             config = {
                 'authorized_users': list(self.authorized_users),
                 'permissions': {
@@ -150,8 +324,7 @@ class AuthManager:
                 }
             }
             
-            with open(auth_file, 'w', encoding='utf-8') as f:
-                yaml.dump(config, f, default_flow_style=False, indent=2)
+            _write_auth_file(self.auth_file, config)
             
             logger.info("Saved authorized users configuration")
             return True
@@ -160,7 +333,11 @@ class AuthManager:
             logger.error(f"Error saving authorized users: {e}")
             return False
     
-    def get_authorized_users(self) -> List[int]:
+    def get_authorized_users(self) -> FrozenSet[int]:
+        """Get authorized user IDs (a shared snapshot, not a copy)"""
+        return self._authorized_users_view
+    
+    def get_authorized_users_list(self) -> List[int]:
         """Get list of authorized user IDs"""
         return list(self.authorized_users)
     
@@ -173,24 +350,20 @@ class AuthManager:
             'owner_only_commands': len(self.owner_only_commands)
         }
 
-# Global auth manager instance
-_auth_manager = None
+# Global auth manager instance, created once at import
+_auth_manager = AuthManager()
 
 def get_auth_manager() -> AuthManager:
     """Get global auth manager instance"""
-    global _auth_manager
-    if _auth_manager is None:
-        _auth_manager = AuthManager()
     return _auth_manager
 
 def is_authorized(user_id: int) -> bool:
     """Quick check if user is authorized"""
-    return get_auth_manager().is_authorized(user_id)
+    return user_id in _auth_set
 
 def is_owner(user_id: int) -> bool:
     """Quick check if user is owner"""
-    return get_auth_manager().is_owner(user_id)
+    return user_id == _owner_id
 
-def can_use_command(user_id: int, command_name: str) -> bool:
-    """Quick check if user can use command"""
-    return get_auth_manager().can_use_command(user_id, command_name)
+# Quick command check bound directly to the global manager
+can_use_command = _auth_manager.can_use_command
@@ -5,50 +5,247 @@ Enhanced SQLite operations with better error handling and modern practices
 
 import sqlite3
 import os
+import asyncio
+import copy
+import functools
+import inspect
+import queue
+import atexit
 import threading
+import time
 import logging
 from datetime import datetime
-from typing import List, Set, Optional, Tuple, Any
+from typing import Dict, List, Set, Optional, Tuple, Any
 from contextlib import contextmanager
 from .helpers import resource_path, load_config
 
 logger = logging.getLogger(__name__)
 
-# Thread-local storage for database connections
-_local = threading.local()
+# Number of pooled SQLite connections
+DB_POOL_SIZE = 8
+
+# Error logs are queued and written in batches by a background thread
+LOG_BATCH_SIZE = 50
+LOG_FLUSH_INTERVAL = 1.0
+LOG_QUEUE_SIZE = 10000
+
+_err_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_log_wakeup = threading.Event()
+_flush_lock = threading.Lock()
+_log_writer: Optional[threading.Thread] = None
+
+# Conversation history keeps only the newest HISTORY_RING_SIZE exchanges per
+# (user, channel), each stored in the slot its sequence number maps to
+HISTORY_RING_SIZE = 20
+
+CHANNEL_ACTIVITY_UPDATE = '''
+    UPDATE active_channels 
+    SET last_activity = CURRENT_TIMESTAMP, 
+        message_count = message_count + 1 
+    WHERE channel_id = ?
+'''
+# Single upsert; the running average is folded in SQL using the pre-update row
+USER_STATS_UPSERT = '''
+    INSERT INTO user_statistics 
+    (user_id, username, total_messages, total_responses, average_response_time) 
+    VALUES (:user_id, :username, 1, 1, COALESCE(:response_time, 0.0))
+    ON CONFLICT(user_id) DO UPDATE SET
+        username = COALESCE(excluded.username, username),
+        total_messages = total_messages + 1,
+        total_responses = total_responses + 1,
+        last_interaction = CURRENT_TIMESTAMP,
+        average_response_time = CASE
+            WHEN :response_time AND average_response_time
+                THEN (average_response_time * total_messages + :response_time) / (total_messages + 1)
+            ELSE COALESCE(NULLIF(average_response_time, 0), :response_time, 0.0)
+        END
+'''
+ERROR_INSERT = '''
+    INSERT INTO error_logs 
+    (error_type, error_message, stack_trace, user_id, channel_id, timestamp) 
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# Columns stored as Unix epoch seconds rather than ISO text
+EPOCH_COLUMNS = (
+    ('conversation_history', 'timestamp'),
+    ('error_logs', 'timestamp'),
+    ('auto_conversations', 'last_auto_message'),
+)
+
+CONVERSATION_HISTORY_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS conversation_history (
+        user_id INTEGER NOT NULL,
+        channel_id INTEGER NOT NULL,
+        slot INTEGER NOT NULL,
+        seq INTEGER NOT NULL,
+        message_content TEXT NOT NULL,
+        response_content TEXT,
+        timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        tokens_used INTEGER DEFAULT 0,
+        model_used TEXT,
+        PRIMARY KEY (user_id, channel_id, slot)
+    ) WITHOUT ROWID
+'''
 
 class DatabaseManager:
     """Enhanced database manager with connection pooling and better error handling"""
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, pool_size: int = DB_POOL_SIZE):
         self.db_path = db_path or resource_path("data/selfbot.db")
         self.ensure_data_directory()
+        # LIFO so the most recently used (warmest) connection is handed out first
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._open_connection())
         self.init_database()
+        self.optimize()
     
     def ensure_data_directory(self):
         """Ensure data directory exists"""
         data_dir = os.path.dirname(self.db_path)
         os.makedirs(data_dir, exist_ok=True)
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a configured connection for the pool"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            timeout=30.0,
+            cached_statements=256,  # Keep every statement in this module compiled
+            isolation_level=None  # Transactions are opened explicitly in get_connection
+        )
+        conn.row_factory = sqlite3.Row
+        self._configure_connection(conn)
+        return conn
+    
     @contextmanager
-    def get_connection(self):
-        """Get database connection with automatic cleanup"""
-        if not hasattr(_local, 'connection'):
-            _local.connection = sqlite3.connect(
-                self.db_path,
-                check_same_thread=False,
-                timeout=30.0
-            )
-            _local.connection.row_factory = sqlite3.Row
+    def get_connection(self, readonly: bool = False):
+        """Check out a pooled database connection with automatic cleanup
         
+        Writers run inside one BEGIN IMMEDIATE transaction that is committed on
+        exit; readonly callers get no transaction and no commit.
+        """
+        conn = self._pool.get()
         try:
-            yield _local.connection
+            if not readonly:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            if not readonly:
+                conn.commit()
         except Exception as e:
-            _local.connection.rollback()
+            if conn.in_transaction:
+                conn.rollback()
             logger.error(f"Database error: {e}")
             raise
         finally:
-            _local.connection.commit()
+            self._pool.put(conn)
+    
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection):
+        """Apply performance PRAGMAs to a newly opened connection"""
+        # WAL lets readers run alongside the writer and appends instead of rewriting pages
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")  # ~20MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
+        conn.execute("PRAGMA analysis_limit=400")  # Bound the rows sampled by ANALYZE/optimize
+    
+    def optimize(self):
+        """Refresh query planner statistics where SQLite considers them stale"""
+        try:
+            with self.get_connection(readonly=True) as conn:
+                conn.execute("PRAGMA optimize")
+        except Exception as e:
+            logger.error(f"Failed to optimize database: {e}")
+    
+    def close(self):
+        """Optimize and close all pooled connections"""
+        self.optimize()
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+    
+    @staticmethod
+    def _migrate_auto_conversations(cursor: sqlite3.Cursor):
+        """Rebuild the old id-keyed auto_conversations table keyed by channel_id
+        
+        The old layout never enforced one row per channel, so INSERT OR REPLACE
+        kept appending rows; only the newest row per channel is carried over.
+        """
+        cursor.execute('PRAGMA table_info(auto_conversations)')
+        if 'id' not in {row[1] for row in cursor}:
+            return
+        
+        cursor.execute('ALTER TABLE auto_conversations RENAME TO auto_conversations_old')
+        cursor.execute('DROP INDEX IF EXISTS idx_auto_conversations_channel')
+        cursor.execute('''
+            CREATE TABLE auto_conversations (
+                channel_id INTEGER PRIMARY KEY,
+                guild_id INTEGER,
+                last_auto_message INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                auto_message_count INTEGER DEFAULT 0,
+                hour_started INTEGER DEFAULT 0,
+                daily_count INTEGER DEFAULT 0,
+                conversation_topic TEXT
+            )
+        ''')
+        cursor.execute('''
+            INSERT INTO auto_conversations 
+            (channel_id, guild_id, last_auto_message, auto_message_count, hour_started, daily_count, conversation_topic)
+            SELECT channel_id, guild_id, last_auto_message, auto_message_count, hour_started, daily_count, conversation_topic
+            FROM auto_conversations_old 
+            WHERE id IN (SELECT MAX(id) FROM auto_conversations_old GROUP BY channel_id)
+        ''')
+        cursor.execute('DROP TABLE auto_conversations_old')
+        logger.info("Migrated auto_conversations to one row per channel")
+    
+    @staticmethod
+    def _migrate_conversation_history(cursor: sqlite3.Cursor):
+        """Rebuild the old append-only conversation_history table as a ring buffer
+        
+        Only the newest HISTORY_RING_SIZE rows per (user, channel) are carried over.
+        """
+        cursor.execute('PRAGMA table_info(conversation_history)')
+        if 'id' not in {row[1] for row in cursor}:
+            return
+        
+        # Dropping the renamed table also drops its old indexes
+        cursor.execute('ALTER TABLE conversation_history RENAME TO conversation_history_old')
+        cursor.execute(CONVERSATION_HISTORY_SCHEMA)
+        cursor.execute(f'''
+            INSERT INTO conversation_history 
+            (user_id, channel_id, slot, seq, message_content, response_content, timestamp, tokens_used, model_used)
+            SELECT user_id, channel_id, seq % {HISTORY_RING_SIZE}, seq, 
+                   message_content, response_content, timestamp, tokens_used, model_used
+            FROM (
+                SELECT *, 
+                       ROW_NUMBER() OVER (PARTITION BY user_id, channel_id ORDER BY id) - 1 AS seq,
+                       COUNT(*) OVER (PARTITION BY user_id, channel_id) AS total
+                FROM conversation_history_old
+            )
+            WHERE total - seq <= {HISTORY_RING_SIZE}
+        ''')
+        cursor.execute('DROP TABLE conversation_history_old')
+        logger.info("Migrated conversation_history to a per-conversation ring buffer")
+    
+    @staticmethod
+    def _migrate_epoch_timestamps(cursor: sqlite3.Cursor):
+        """Convert the ISO text timestamps of older databases to Unix epoch integers"""
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] >= 1:
+            return
+        
+        for table, column in EPOCH_COLUMNS:
+            cursor.execute(f'''
+                UPDATE {table} SET {column} = CAST(strftime('%s', {column}) AS INTEGER) 
+                WHERE typeof({column}) = 'text'
+            ''')
+        cursor.execute('PRAGMA user_version = 1')
     
     def init_database(self):
         """Initialize database with enhanced schema"""
@@ -80,19 +277,9 @@ class DatabaseManager:
                     )
                 ''')
                 
-                # Conversation history table (new)
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS conversation_history (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        channel_id INTEGER NOT NULL,
-                        message_content TEXT NOT NULL,
-                        response_content TEXT,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        tokens_used INTEGER DEFAULT 0,
-                        model_used TEXT
-                    )
-                ''')
+                # Conversation history table (new), a fixed ring of slots per conversation
+                self._migrate_conversation_history(cursor)
+                cursor.execute(CONVERSATION_HISTORY_SCHEMA)
                 
                 # User statistics table (new)
                 cursor.execute('''
@@ -127,17 +314,17 @@ class DatabaseManager:
                         stack_trace TEXT,
                         user_id INTEGER,
                         channel_id INTEGER,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        timestamp INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
                     )
                 ''')
                 
-                # Auto conversation tracking table (new)
+                # Auto conversation tracking table (new), one row per channel
+                self._migrate_auto_conversations(cursor)
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS auto_conversations (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        channel_id INTEGER NOT NULL,
+                        channel_id INTEGER PRIMARY KEY,
                         guild_id INTEGER,
-                        last_auto_message TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        last_auto_message INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                         auto_message_count INTEGER DEFAULT 0,
                         hour_started INTEGER DEFAULT 0,
                         daily_count INTEGER DEFAULT 0,
@@ -146,32 +333,20 @@ class DatabaseManager:
                 ''')
                 
                 # Create indexes for better performance
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_conversation_user_channel 
-                    ON conversation_history(user_id, channel_id)
-                ''')
-                
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_conversation_timestamp 
-                    ON conversation_history(timestamp)
-                ''')
-                
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_user_stats_last_interaction 
-                    ON user_statistics(last_interaction)
-                ''')
+                # History lookups are served by the conversation_history primary key,
+                # which holds at most HISTORY_RING_SIZE rows per conversation
+                # Nothing queries user_statistics by last_interaction; the index only
+                # added a write to every update_user_stats call
+                cursor.execute('DROP INDEX IF EXISTS idx_user_stats_last_interaction')
                 
+                cursor.execute('DROP INDEX IF EXISTS idx_error_logs_timestamp')
                 cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_error_logs_timestamp 
-                    ON error_logs(timestamp)
+                    CREATE INDEX IF NOT EXISTS idx_err_ts_type 
+                    ON error_logs(timestamp DESC, error_type)
                 ''')
                 
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_auto_conversations_channel 
-                    ON auto_conversations(channel_id)
-                ''')
+                self._migrate_epoch_timestamps(cursor)
                 
-                conn.commit()
                 logger.info("Database initialized successfully")
                 
         except Exception as e:
@@ -185,6 +360,9 @@ def init_db(db_path: str = None):
     """Initialize database manager"""
     global _db_manager
     _db_manager = DatabaseManager(db_path)
+    # Registered before the log writer's flush so queued logs are written first
+    atexit.register(_db_manager.close)
+    _start_log_writer()
 
 def get_db_manager() -> DatabaseManager:
     """Get database manager instance"""
@@ -192,21 +370,132 @@ def get_db_manager() -> DatabaseManager:
         init_db()
     return _db_manager
 
+# Batched log writer
+def _drain(log_queue: queue.Queue, limit: int) -> List[tuple]:
+    """Take up to `limit` queued rows without blocking"""
+    batch = []
+    while len(batch) < limit:
+        try:
+            batch.append(log_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+def flush_logs():
+    """Write all queued error logs to the database"""
+    with _flush_lock:
+        while True:
+            errors = _drain(_err_queue, LOG_BATCH_SIZE)
+            if not errors:
+                return
+            
+            try:
+                db = get_db_manager()
+                with db.get_connection() as conn:
+                    conn.executemany(ERROR_INSERT, errors)
+            except Exception as e:
+                logger.error(f"Failed to write {len(errors)} error logs: {e}")
+                return
+
+def _log_writer_loop():
+    """Flush queued logs every interval, or sooner once a batch fills up"""
+    while True:
+        _log_wakeup.wait(LOG_FLUSH_INTERVAL)
+        _log_wakeup.clear()
+        flush_logs()
+
+def _start_log_writer():
+    """Start the background log writer thread once"""
+    global _log_writer
+    if _log_writer is None:
+        _log_writer = threading.Thread(target=_log_writer_loop, name="db-log-writer", daemon=True)
+        _log_writer.start()
+        atexit.register(flush_logs)
+
+def _enqueue_log(log_queue: queue.Queue, row: tuple) -> bool:
+    """Queue a log row for the background writer"""
+    try:
+        log_queue.put_nowait(row)
+    except queue.Full:
+        return False
+    
+    if log_queue.qsize() >= LOG_BATCH_SIZE:
+        _log_wakeup.set()
+    return True
+
+def db_call(readonly: bool = False, on_error: Any = None, error: str = "Database call failed",
+            flush: bool = False):
+    """Run the decorated function with a pooled connection as its first argument
+    
+    Writers run in one transaction. Any exception is logged using `error`,
+    formatted with the call's arguments, and a copy of `on_error` is returned.
+    With flush=True queued logs are written before the connection is taken.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if flush:
+                flush_logs()  # Include logs still waiting in the write queue
+            try:
+                with get_db_manager().get_connection(readonly=readonly) as conn:
+                    return func(conn, *args, **kwargs)
+            except Exception as e:
+                bound = signature.bind_partial(None, *args, **kwargs)
+                bound.apply_defaults()
+                logger.error(f"{error.format(**bound.arguments)}: {e}")
+                return copy.copy(on_error)
+        
+        # Callers never pass the connection
+        wrapper.__signature__ = signature.replace(parameters=list(signature.parameters.values())[1:])
+        return wrapper
+    return decorator
+
+# In-process copies of the active channel and ignored user tables, loaded on
+# first read and kept in step by the add/remove functions after each commit
+_cache_lock = threading.RLock()
+_id_caches: Dict[str, Set[int]] = {}
+
+def _load_id_cache(table: str, column: str) -> Set[int]:
+    """Get the cached ID set for a lookup table, loading it on first use"""
+    with _cache_lock:
+        ids = _id_caches.get(table)
+        if ids is None:
+            db = get_db_manager()
+            with db.get_connection(readonly=True) as conn:
+                ids = _id_caches[table] = {row[0] for row in conn.execute(f'SELECT {column} FROM {table}')}
+        return ids
+
+def _update_id_cache(table: str, item_id: int, present: bool):
+    """Apply a committed add/remove to a loaded ID cache"""
+    with _cache_lock:
+        ids = _id_caches.get(table)
+        if ids is not None:
+            if present:
+                ids.add(item_id)
+            else:
+                ids.discard(item_id)
+
 # Channel management functions
 def add_channel(channel_id: int, guild_id: int = None, channel_name: str = None, added_by: int = None) -> bool:
     """Add channel to active channels"""
     try:
         db = get_db_manager()
         with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO active_channels 
+            conn.execute('''
+                INSERT INTO active_channels 
                 (channel_id, guild_id, channel_name, added_by, last_activity) 
                 VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(channel_id) DO UPDATE SET
+                    guild_id = excluded.guild_id,
+                    channel_name = excluded.channel_name,
+                    last_activity = CURRENT_TIMESTAMP
             ''', (channel_id, guild_id, channel_name, added_by))
-            
-            logger.info(f"Added channel {channel_id} to active channels")
-            return True
+        
+        _update_id_cache('active_channels', channel_id, True)
+        logger.info(f"Added channel {channel_id} to active channels")
+        return True
             
     except Exception as e:
         logger.error(f"Failed to add channel {channel_id}: {e}")
@@ -217,15 +506,16 @@ def remove_channel(channel_id: int) -> bool:
     try:
         db = get_db_manager()
         with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM active_channels WHERE channel_id = ?', (channel_id,))
-            
-            if cursor.rowcount > 0:
-                logger.info(f"Removed channel {channel_id} from active channels")
-                return True
-            else:
-                logger.warning(f"Channel {channel_id} was not in active channels")
-                return False
+            cur = conn.execute('DELETE FROM active_channels WHERE channel_id = ?', (channel_id,))
+            removed = cur.rowcount > 0
+        
+        if removed:
+            _update_id_cache('active_channels', channel_id, False)
+            logger.info(f"Removed channel {channel_id} from active channels")
+            return True
+        else:
+            logger.warning(f"Channel {channel_id} was not in active channels")
+            return False
                 
     except Exception as e:
         logger.error(f"Failed to remove channel {channel_id}: {e}")
@@ -234,34 +524,19 @@ def remove_channel(channel_id: int) -> bool:
 def get_channels() -> List[int]:
     """Get list of active channel IDs"""
     try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT channel_id FROM active_channels')
-            return [row[0] for row in cursor.fetchall()]
+        with _cache_lock:
+            return list(_load_id_cache('active_channels', 'channel_id'))
             
     except Exception as e:
         logger.error(f"Failed to get channels: {e}")
         return []
 
-def update_channel_activity(channel_id: int) -> bool:
+@db_call(on_error=False, error="Failed to update channel activity for {channel_id}")
+def update_channel_activity(conn: sqlite3.Connection, channel_id: int) -> bool:
     """Update last activity timestamp for channel"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE active_channels 
-                SET last_activity = CURRENT_TIMESTAMP, 
-                    message_count = message_count + 1 
-                WHERE channel_id = ?
-            ''', (channel_id,))
-            
-            return cursor.rowcount > 0
-            
-    except Exception as e:
-        logger.error(f"Failed to update channel activity for {channel_id}: {e}")
-        return False
+    cur = conn.execute(CHANNEL_ACTIVITY_UPDATE, (channel_id,))
+    
+    return cur.rowcount > 0
 
 # User management functions
 def add_ignored_user(user_id: int, username: str = None, reason: str = None, ignored_by: int = None) -> bool:
@@ -269,15 +544,19 @@ def add_ignored_user(user_id: int, username: str = None, reason: str = None, ign
     try:
         db = get_db_manager()
         with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO ignored_users 
+            conn.execute('''
+                INSERT INTO ignored_users 
                 (user_id, username, reason, ignored_by) 
                 VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    username = excluded.username,
+                    reason = excluded.reason,
+                    ignored_by = excluded.ignored_by
             ''', (user_id, username, reason, ignored_by))
-            
-            logger.info(f"Added user {user_id} to ignored list")
-            return True
+        
+        _update_id_cache('ignored_users', user_id, True)
+        logger.info(f"Added user {user_id} to ignored list")
+        return True
             
     except Exception as e:
         logger.error(f"Failed to add ignored user {user_id}: {e}")
@@ -288,15 +567,16 @@ def remove_ignored_user(user_id: int) -> bool:
     try:
         db = get_db_manager()
         with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM ignored_users WHERE user_id = ?', (user_id,))
-            
-            if cursor.rowcount > 0:
-                logger.info(f"Removed user {user_id} from ignored list")
-                return True
-            else:
-                logger.warning(f"User {user_id} was not in ignored list")
-                return False
+            cur = conn.execute('DELETE FROM ignored_users WHERE user_id = ?', (user_id,))
+            removed = cur.rowcount > 0
+        
+        if removed:
+            _update_id_cache('ignored_users', user_id, False)
+            logger.info(f"Removed user {user_id} from ignored list")
+            return True
+        else:
+            logger.warning(f"User {user_id} was not in ignored list")
+            return False
                 
     except Exception as e:
         logger.error(f"Failed to remove ignored user {user_id}: {e}")
@@ -305,361 +585,301 @@ def remove_ignored_user(user_id: int) -> bool:
 def get_ignored_users() -> Set[int]:
     """Get set of ignored user IDs"""
     try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT user_id FROM ignored_users')
-            return {row[0] for row in cursor.fetchall()}
+        with _cache_lock:
+            return set(_load_id_cache('ignored_users', 'user_id'))
             
     except Exception as e:
         logger.error(f"Failed to get ignored users: {e}")
         return set()
 
 # Conversation history functions
-def log_conversation(user_id: int, channel_id: int, message_content: str, 
-                    response_content: str = None, tokens_used: int = 0, model_used: str = None) -> bool:
-    """Log conversation to database"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO conversation_history 
-                (user_id, channel_id, message_content, response_content, tokens_used, model_used) 
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (user_id, channel_id, message_content, response_content, tokens_used, model_used))
-            
-            return True
-            
-    except Exception as e:
-        logger.error(f"Failed to log conversation: {e}")
-        return False
-
-def get_conversation_history(user_id: int, channel_id: int = None, limit: int = 10) -> List[Tuple[str, str]]:
+@db_call(readonly=True, on_error=[], error="Failed to get conversation history", flush=True)
+def get_conversation_history(conn: sqlite3.Connection, user_id: int, channel_id: int = None, limit: int = 10) -> List[Tuple[str, str]]:
     """Get conversation history for user"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            if channel_id:
-                cursor.execute('''
-                    SELECT message_content, response_content 
-                    FROM conversation_history 
-                    WHERE user_id = ? AND channel_id = ? 
-                    ORDER BY timestamp DESC 
-                    LIMIT ?
-                ''', (user_id, channel_id, limit))
-            else:
-                cursor.execute('''
-                    SELECT message_content, response_content 
-                    FROM conversation_history 
-                    WHERE user_id = ? 
-                    ORDER BY timestamp DESC 
-                    LIMIT ?
-                ''', (user_id, limit))
-            
-            return [(row[0], row[1]) for row in cursor.fetchall() if row[1]]
-            
-    except Exception as e:
-        logger.error(f"Failed to get conversation history: {e}")
-        return []
+    if channel_id:
+        cur = conn.execute('''
+            SELECT message_content, response_content 
+            FROM conversation_history 
+            WHERE user_id = ? AND channel_id = ? 
+            ORDER BY seq DESC 
+            LIMIT ?
+        ''', (user_id, channel_id, limit))
+    else:
+        cur = conn.execute('''
+            SELECT message_content, response_content 
+            FROM conversation_history 
+            WHERE user_id = ? 
+            ORDER BY timestamp DESC, seq DESC 
+            LIMIT ?
+        ''', (user_id, limit))
+    
+    return [(row[0], row[1]) for row in cur if row[1]]
 
 # User statistics functions
-def update_user_stats(user_id: int, username: str = None, response_time: float = None) -> bool:
+@db_call(on_error=False, error="Failed to update user stats for {user_id}")
+def update_user_stats(conn: sqlite3.Connection, user_id: int, username: str = None, response_time: float = None) -> bool:
     """Update user statistics"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Check if user exists
-            cursor.execute('SELECT total_messages, average_response_time FROM user_statistics WHERE user_id = ?', (user_id,))
-            result = cursor.fetchone()
-            
-            if result:
-                total_messages, avg_response_time = result
-                new_total = total_messages + 1
-                
-                if response_time and avg_response_time:
-                    new_avg = (avg_response_time * total_messages + response_time) / new_total
-                else:
-                    new_avg = avg_response_time or response_time or 0.0
-                
-                cursor.execute('''
-                    UPDATE user_statistics 
-                    SET username = COALESCE(?, username),
-                        total_messages = ?,
-                        total_responses = total_responses + 1,
-                        last_interaction = CURRENT_TIMESTAMP,
-                        average_response_time = ?
-                    WHERE user_id = ?
-                ''', (username, new_total, new_avg, user_id))
-            else:
-                cursor.execute('''
-                    INSERT INTO user_statistics 
-                    (user_id, username, total_messages, total_responses, average_response_time) 
-                    VALUES (?, ?, 1, 1, ?)
-                ''', (user_id, username, response_time or 0.0))
-            
-            return True
-            
-    except Exception as e:
-        logger.error(f"Failed to update user stats for {user_id}: {e}")
-        return False
+    conn.execute(USER_STATS_UPSERT, {'user_id': user_id, 'username': username, 'response_time': response_time})
+    
+    return True
 
-def get_user_stats(user_id: int) -> Optional[dict]:
+@db_call(readonly=True, on_error=None, error="Failed to get user stats for {user_id}")
+def get_user_stats(conn: sqlite3.Connection, user_id: int) -> Optional[dict]:
     """Get user statistics"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT username, total_messages, total_responses, 
-                       first_interaction, last_interaction, average_response_time, preferred_topics
-                FROM user_statistics 
-                WHERE user_id = ?
-            ''', (user_id,))
-            
-            result = cursor.fetchone()
-            if result:
-                return {
-                    'username': result[0],
-                    'total_messages': result[1],
-                    'total_responses': result[2],
-                    'first_interaction': result[3],
-                    'last_interaction': result[4],
-                    'average_response_time': result[5],
-                    'preferred_topics': result[6]
-                }
-            
-            return None
-            
-    except Exception as e:
-        logger.error(f"Failed to get user stats for {user_id}: {e}")
-        return None
+    cur = conn.execute('''
+        SELECT username, total_messages, total_responses, 
+               first_interaction, last_interaction, average_response_time, preferred_topics
+        FROM user_statistics 
+        WHERE user_id = ?
+    ''', (user_id,))
+    
+    result = cur.fetchone()
+    if result:
+        return {
+            'username': result[0],
+            'total_messages': result[1],
+            'total_responses': result[2],
+            'first_interaction': result[3],
+            'last_interaction': result[4],
+            'average_response_time': result[5],
+            'preferred_topics': result[6]
+        }
+    
+    return None
 
 # Error logging functions
 def log_error(error_type: str, error_message: str, stack_trace: str = None, 
               user_id: int = None, channel_id: int = None) -> bool:
-    """Log error to database"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO error_logs 
-                (error_type, error_message, stack_trace, user_id, channel_id) 
-                VALUES (?, ?, ?, ?, ?)
-            ''', (error_type, error_message, stack_trace, user_id, channel_id))
-            
-            return True
-            
-    except Exception as e:
-        logger.error(f"Failed to log error: {e}")
+    """Queue error to be logged to database"""
+    if not _enqueue_log(_err_queue, (error_type, error_message, stack_trace, user_id, channel_id, int(time.time()))):
+        logger.error("Failed to log error: log queue is full")
         return False
+    return True
 
-def get_recent_errors(limit: int = 50) -> List[dict]:
+# Keys of the dicts returned by get_recent_errors, in SELECT column order
+_ERROR_KEYS = ('error_type', 'error_message', 'stack_trace', 'user_id', 'channel_id', 'timestamp')
+
+@db_call(readonly=True, on_error=[], error="Failed to get recent errors", flush=True)
+def get_recent_errors(conn: sqlite3.Connection, limit: int = 50) -> List[dict]:
     """Get recent errors from database"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT error_type, error_message, stack_trace, user_id, channel_id, timestamp
-                FROM error_logs 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            ''', (limit,))
-            
-            return [
-                {
-                    'error_type': row[0],
-                    'error_message': row[1],
-                    'stack_trace': row[2],
-                    'user_id': row[3],
-                    'channel_id': row[4],
-                    'timestamp': row[5]
-                }
-                for row in cursor.fetchall()
-            ]
-            
-    except Exception as e:
-        logger.error(f"Failed to get recent errors: {e}")
-        return []
+    cur = conn.execute('''
+        SELECT error_type, error_message, stack_trace, user_id, channel_id, timestamp
+        FROM error_logs 
+        ORDER BY timestamp DESC 
+        LIMIT ?
+    ''', (limit,))
+    
+    return [dict(zip(_ERROR_KEYS, row)) for row in cur]
 
 # Cleanup functions
 def cleanup_old_data(days: int = 30) -> bool:
     """Clean up old data from database"""
+    flush_logs()  # Include logs still waiting in the write queue
     try:
         db = get_db_manager()
         with db.get_connection() as conn:
-            cursor = conn.cursor()
+            cutoff = int(time.time()) - int(days) * 86400
             
-            # Clean old conversation history
-            cursor.execute('''
-                DELETE FROM conversation_history 
-                WHERE timestamp < datetime('now', '-{} days')
-            '''.format(days))
-            conv_deleted = cursor.rowcount
+            # Clean old conversation history and error logs in one transaction
+            cur = conn.execute("DELETE FROM conversation_history WHERE timestamp < ?", (cutoff,))
+            conv_deleted = cur.rowcount
             
-            # Clean old error logs
-            cursor.execute('''
-                DELETE FROM error_logs 
-                WHERE timestamp < datetime('now', '-{} days')
-            '''.format(days))
-            error_deleted = cursor.rowcount
+            cur = conn.execute("DELETE FROM error_logs WHERE timestamp < ?", (cutoff,))
+            error_deleted = cur.rowcount
             
             logger.info(f"Cleaned up {conv_deleted} conversation records and {error_deleted} error logs")
-            return True
+        
+        # Refresh planner statistics for the shrunken tables and truncate the WAL
+        # once the deletes are committed
+        with db.get_connection(readonly=True) as conn:
+            conn.execute("ANALYZE conversation_history")
+            conn.execute("ANALYZE error_logs")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        
+        return True
             
     except Exception as e:
         logger.error(f"Failed to cleanup old data: {e}")
         return False
 
-def get_database_stats() -> dict:
+@db_call(readonly=True, on_error={}, error="Failed to get database stats", flush=True)
+def get_database_stats(conn: sqlite3.Connection) -> dict:
     """Get database statistics"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            stats = {}
-            
-            # Active channels count
-            cursor.execute('SELECT COUNT(*) FROM active_channels')
-            stats['active_channels'] = cursor.fetchone()[0]
-            
-            # Ignored users count
-            cursor.execute('SELECT COUNT(*) FROM ignored_users')
-            stats['ignored_users'] = cursor.fetchone()[0]
-            
-            # Conversation history count
-            cursor.execute('SELECT COUNT(*) FROM conversation_history')
-            stats['conversation_records'] = cursor.fetchone()[0]
-            
-            # User statistics count
-            cursor.execute('SELECT COUNT(*) FROM user_statistics')
-            stats['tracked_users'] = cursor.fetchone()[0]
-            
-            # Error logs count
-            cursor.execute('SELECT COUNT(*) FROM error_logs')
-            stats['error_logs'] = cursor.fetchone()[0]
-            
-            # Database file size
-            if os.path.exists(db.db_path):
-                stats['database_size'] = os.path.getsize(db.db_path)
-            else:
-                stats['database_size'] = 0
-            
-            return stats
-            
-    except Exception as e:
-        logger.error(f"Failed to get database stats: {e}")
-        return {}
+    # All table counts in a single statement
+    cur = conn.execute('''
+        SELECT
+            (SELECT COUNT(*) FROM active_channels),
+            (SELECT COUNT(*) FROM ignored_users),
+            (SELECT COUNT(*) FROM conversation_history),
+            (SELECT COUNT(*) FROM user_statistics),
+            (SELECT COUNT(*) FROM error_logs)
+    ''')
+    row = cur.fetchone()
+    
+    stats = {
+        'active_channels': row[0],
+        'ignored_users': row[1],
+        'conversation_records': row[2],
+        'tracked_users': row[3],
+        'error_logs': row[4]
+    }
+    
+    # Database file size
+    db_path = get_db_manager().db_path
+    if os.path.exists(db_path):
+        stats['database_size'] = os.path.getsize(db_path)
+    else:
+        stats['database_size'] = 0
+    
+    return stats
 
-def can_send_auto_message(channel_id: int) -> bool:
-    """Check if bot can send an auto-initiated message in this channel"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Get current hour for rate limiting
-            current_hour = datetime.now().hour
-            
-            cursor.execute('''
-                SELECT auto_message_count, hour_started, last_auto_message
-                FROM auto_conversations 
-                WHERE channel_id = ?
-            ''', (channel_id,))
-            
-            result = cursor.fetchone()
-            
-            if not result:
-                # First time for this channel - allow
-                return True
-                
-            count, hour_started, last_message = result
-            
-            # Reset count if it's a new hour
-            if hour_started != current_hour:
-                cursor.execute('''
-                    UPDATE auto_conversations 
-                    SET auto_message_count = 0, hour_started = ?
-                    WHERE channel_id = ?
-                ''', (current_hour, channel_id))
-                conn.commit()
-                return True
-            
-            # Check hourly limit
-            config = load_config()
-            max_per_hour = config.get('bot', {}).get('auto_conversation_max_per_hour', 6)
-            
-            if count >= max_per_hour:
-                return False
-                
-            # Check time interval since last auto message
-            if last_message:
-                last_time = datetime.fromisoformat(last_message)
-                interval = config.get('bot', {}).get('auto_conversation_interval', 300)
-                if (datetime.now() - last_time).total_seconds() < interval:
-                    return False
-            
-            return True
-            
-    except Exception as e:
-        logger.error(f"Failed to check auto message permission: {e}")
+# Auto conversation limits, reread from the config at most once per TTL
+AUTO_CONFIG_TTL = 60.0
+_auto_cfg_cache = {'ts': float('-inf'), 'max_per_hour': 6, 'interval': 300}
+
+def _get_auto_cfg() -> Tuple[int, int]:
+    """Get (max_per_hour, interval) for auto messages from the cached config"""
+    now = time.monotonic()
+    if now - _auto_cfg_cache['ts'] > AUTO_CONFIG_TTL:
+        bot_config = load_config().get('bot', {})
+        _auto_cfg_cache['max_per_hour'] = bot_config.get('auto_conversation_max_per_hour', 6)
+        _auto_cfg_cache['interval'] = bot_config.get('auto_conversation_interval', 300)
+        _auto_cfg_cache['ts'] = now
+    return _auto_cfg_cache['max_per_hour'], _auto_cfg_cache['interval']
+
+@db_call(readonly=True, on_error=False, error="Failed to check auto message permission")
+def can_send_auto_message(conn: sqlite3.Connection, channel_id: int) -> bool:
+    """Check if bot can send an auto-initiated message in this channel
+    
+    Read-only pre-check to avoid generating a message that cannot be sent;
+    try_record_auto_message makes the authoritative decision.
+    """
+    # Get current hour for rate limiting
+    current_hour = datetime.now().hour
+    
+    cur = conn.execute('''
+        SELECT auto_message_count, hour_started, last_auto_message
+        FROM auto_conversations 
+        WHERE channel_id = ?
+    ''', (channel_id,))
+    
+    result = cur.fetchone()
+    
+    if not result:
+        # First time for this channel - allow
+        return True
+    
+    count, hour_started, last_message = result
+    
+    # A new hour starts a fresh count (reset when the next message is recorded)
+    if hour_started != current_hour:
+        return True
+    
+    # Check hourly limit
+    max_per_hour, interval = _get_auto_cfg()
+    
+    if count >= max_per_hour:
         return False
+    
+    # Check time interval since last auto message
+    if last_message:
+        if time.time() - last_message < interval:
+            return False
+    
+    return True
 
-def record_auto_message(channel_id: int, guild_id: int = None, topic: str = None) -> bool:
+@db_call(on_error=False, error="Failed to record auto message")
+def record_auto_message(conn: sqlite3.Connection, channel_id: int, guild_id: int = None, topic: str = None) -> bool:
     """Record that an auto-initiated message was sent"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            current_hour = datetime.now().hour
-            
-            # Update or insert auto conversation record
-            cursor.execute('''
-                INSERT OR REPLACE INTO auto_conversations 
-                (channel_id, guild_id, last_auto_message, auto_message_count, hour_started, conversation_topic)
-                VALUES (?, ?, datetime('now'), 
-                       COALESCE((SELECT auto_message_count FROM auto_conversations WHERE channel_id = ?) + 1, 1),
-                       ?, ?)
-            ''', (channel_id, guild_id, channel_id, current_hour, topic))
-            
-            conn.commit()
-            return True
-            
-    except Exception as e:
-        logger.error(f"Failed to record auto message: {e}")
-        return False
+    current_hour = datetime.now().hour
+    
+    # Update or insert auto conversation record
+    conn.execute('''
+        INSERT INTO auto_conversations 
+        (channel_id, guild_id, last_auto_message, auto_message_count, hour_started, conversation_topic)
+        VALUES (?, ?, ?, 1, ?, ?)
+        ON CONFLICT(channel_id) DO UPDATE SET
+            guild_id = excluded.guild_id,
+            last_auto_message = excluded.last_auto_message,
+            auto_message_count = auto_message_count + 1,
+            hour_started = excluded.hour_started,
+            conversation_topic = excluded.conversation_topic
+    ''', (channel_id, guild_id, int(time.time()), current_hour, topic))
+    
+    return True
 
-def get_auto_conversation_stats(channel_id: int) -> dict:
+@db_call(on_error=False, error="Failed to record auto message")
+def try_record_auto_message(conn: sqlite3.Connection, channel_id: int, guild_id: int = None,
+                            topic: str = None, max_per_hour: int = 6, interval: int = 300) -> bool:
+    """Atomically check the auto message limits for a channel and record a send
+    
+    Returns True (and records the message) only if the hourly limit and the
+    minimum interval allow it; otherwise nothing is written.
+    """
+    # The DO UPDATE only fires when the limits allow it, so RETURNING yields
+    # a row exactly when the message may be sent
+    cur = conn.execute('''
+        INSERT INTO auto_conversations 
+        (channel_id, guild_id, last_auto_message, auto_message_count, hour_started, conversation_topic)
+        VALUES (:channel_id, :guild_id, :now, 1, :hour, :topic)
+        ON CONFLICT(channel_id) DO UPDATE SET
+            guild_id = excluded.guild_id,
+            last_auto_message = excluded.last_auto_message,
+            auto_message_count = CASE WHEN hour_started != :hour THEN 1 ELSE auto_message_count + 1 END,
+            hour_started = :hour,
+            conversation_topic = excluded.conversation_topic
+        WHERE hour_started != :hour
+           OR (auto_message_count < :max_per_hour
+               AND (last_auto_message IS NULL
+                    OR :now - last_auto_message >= :interval))
+        RETURNING auto_message_count
+    ''', {
+        'channel_id': channel_id, 'guild_id': guild_id, 'now': int(time.time()), 'hour': datetime.now().hour,
+        'topic': topic, 'max_per_hour': max_per_hour, 'interval': interval
+    })
+    
+    return cur.fetchone() is not None
+
+@db_call(readonly=True, on_error={'hourly_count': 0, 'last_message': None, 'topic': None},
+         error="Failed to get auto conversation stats")
+def get_auto_conversation_stats(conn: sqlite3.Connection, channel_id: int) -> dict:
     """Get auto conversation statistics for a channel"""
-    try:
-        db = get_db_manager()
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT auto_message_count, last_auto_message, conversation_topic
-                FROM auto_conversations 
-                WHERE channel_id = ?
-            ''', (channel_id,))
-            
-            result = cursor.fetchone()
-            
-            if result:
-                return {
-                    'hourly_count': result[0],
-                    'last_message': result[1],
-                    'topic': result[2]
-                }
-            else:
-                return {'hourly_count': 0, 'last_message': None, 'topic': None}
-                
-    except Exception as e:
-        logger.error(f"Failed to get auto conversation stats: {e}")
+    cur = conn.execute('''
+        SELECT auto_message_count, last_auto_message, conversation_topic
+        FROM auto_conversations 
+        WHERE channel_id = ?
+    ''', (channel_id,))
+    
+    result = cur.fetchone()
+    
+    if result:
+        return {
+            'hourly_count': result[0],
+            'last_message': result[1],
+            'topic': result[2]
+        }
+    else:
         return {'hourly_count': 0, 'last_message': None, 'topic': None}
+
+# Async wrappers that run blocking database calls in a worker thread so the
+# event loop keeps serving Discord while SQLite waits on locks or disk
+async def aget_recent_errors(limit: int = 50) -> List[dict]:
+    """Async version of get_recent_errors"""
+    return await asyncio.to_thread(get_recent_errors, limit)
+
+async def acleanup_old_data(days: int = 30) -> bool:
+    """Async version of cleanup_old_data"""
+    return await asyncio.to_thread(cleanup_old_data, days)
+
+async def aget_database_stats() -> dict:
+    """Async version of get_database_stats"""
+    return await asyncio.to_thread(get_database_stats)
+
+async def acan_send_auto_message(channel_id: int) -> bool:
+    """Async version of can_send_auto_message"""
+    return await asyncio.to_thread(can_send_auto_message, channel_id)
+
+async def atry_record_auto_message(channel_id: int, guild_id: int = None, topic: str = None,
+                                   max_per_hour: int = 6, interval: int = 300) -> bool:
+    """Async version of try_record_auto_message"""
+    return await asyncio.to_thread(try_record_auto_message, channel_id, guild_id, topic, max_per_hour, interval)
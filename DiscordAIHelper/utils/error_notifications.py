@@ -4,204 +4,484 @@ Enhanced webhook and logging system for 2025
 """
 
 import os
+import re
 import asyncio
-import json
 import logging
 import traceback
 import time
+import zlib
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
 import httpx
 import discord
 
 from .db import log_error
+from .helpers import load_config
+
+# Prefer orjson for encoding webhook payloads, falling back to the standard library
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
 logger = logging.getLogger(__name__)
 
+# Queued notification embeds are posted together, up to Discord's per-message limit
+WEBHOOK_MAX_EMBEDS = 10
+EMBED_BATCH_WINDOW = 0.5  # Seconds to wait for more embeds before posting
+EMBED_QUEUE_SIZE = 500
+MAX_WEBHOOK_RETRIES = 3
+WEBHOOK_CONCURRENCY = 4  # Maximum webhook posts in flight at once
+DROP_LOG_INTERVAL = 60.0  # Seconds between warnings about dropped notifications
+
+# Fixed parts of the error notification embeds
+_EMBED_TITLE = "🔴 Discord AI Selfbot Error"
+_EMBED_COLOR = 0xFF0000  # Red color
+_FOOTER_VERSION = "Selfbot v3.0.0"
+_FOOTER_PREFIX = f"{_FOOTER_VERSION} • "
+
+# Error embed fields as (name, error_data key, default, code block, max length, inline)
+_EMBED_FIELDS = (
+    ("Error Type", "error_type", "Unknown", True, None, True),
+    ("Severity", "severity", "Medium", False, None, True),
+    ("User ID", "user_id", "N/A", False, None, True),
+    ("Channel ID", "channel_id", "N/A", False, None, True),
+    ("Error Message", "error_message", "No message", True, 1000, False),
+)
+
+# Per-error notification token bucket: bursts of up to NOTIFY_BURST, then one
+# notification per NOTIFY_REFILL_SECONDS
+NOTIFY_BURST = 3.0
+NOTIFY_REFILL_SECONDS = 300.0
+NOTIFY_SWEEP_INTERVAL = 600.0  # Seconds between sweeps of idle error keys
+NOTIFY_IDLE_EXPIRY = 3600.0    # Error keys unseen for this long are forgotten
+MAX_TRACKED_ERRORS = 4096      # Least recently seen error keys beyond this are evicted
+
+# Errors seen more than this many times in the last hour only refill one
+# notification every FREQUENT_REFILL_SECONDS
+FREQUENT_ERROR_THRESHOLD = 5
+FREQUENT_REFILL_SECONDS = 1800.0
+
+# Severity keywords, matched case-insensitively anywhere in the error message
+_CRITICAL_RE = re.compile(
+    r"token|unauthorized|forbidden|authentication|database|corruption|segmentation fault", re.IGNORECASE
+)
+_HIGH_RE = re.compile(r"rate limit|quota|api|connection|timeout", re.IGNORECASE)
+_MEDIUM_RE = re.compile(r"permission|missing|not found|invalid", re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def _classify_severity(error_message: str) -> str:
+    """Classify an error message by severity keywords (messages recur, so results are cached)"""
+    # Critical errors
+    if _CRITICAL_RE.search(error_message):
+        return "🔴 Critical"
+    
+    # High severity
+    elif _HIGH_RE.search(error_message):
+        return "🟠 High"
+    
+    # Medium severity  
+    elif _MEDIUM_RE.search(error_message):
+        return "🟡 Medium"
+    
+    # Low severity
+    else:
+        return "🟢 Low"
+
+class BucketRing:
+    """Error counts for the last hour in a ring of one-minute buckets"""
+    __slots__ = ("buckets", "head_minute")
+    
+    def __init__(self, minute: int):
+        self.buckets: List[int] = [0] * 60
+        self.head_minute = minute
+    
+    def _advance(self, minute: int):
+        """Zero the buckets for minutes that passed since the last update"""
+        elapsed = minute - self.head_minute
+        if elapsed >= 60:
+            self.buckets[:] = [0] * 60
+        else:
+            for m in range(self.head_minute + 1, minute + 1):
+                self.buckets[m % 60] = 0
+        if elapsed > 0:
+            self.head_minute = minute
+    
+    def add(self, minute: int) -> int:
+        """Count one error in `minute` and return the count for the last hour"""
+        self._advance(minute)
+        self.buckets[minute % 60] += 1
+        return sum(self.buckets)
+    
+    def count(self, minute: int) -> int:
+        """Get the error count for the hour ending at `minute`"""
+        self._advance(minute)
+        return sum(self.buckets)
+
 class ErrorNotificationManager:
     """Enhanced error notification system with webhook support"""
     
     def __init__(self):
         self.webhook_url = os.getenv("ERROR_WEBHOOK_URL")
-        self.rate_limit_window = {}  # Track rate limits per error type
-        self.last_error_times = {}   # Track last occurrence of each error
-        self.error_counts = {}       # Count occurrences of each error
+        self._enabled = bool(self.webhook_url)
+        # (tokens, last refill time) per error key, least recently seen first
+        self._buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+        # Errors per key over the last hour
+        self._rings: Dict[str, BucketRing] = {}
+        self.total_errors = 0
+        self._last_sweep = time.monotonic()
+        # Keep-alive client reused for every webhook post, created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+        # Loop-bound state, created on the running loop by _bind_loop: embeds
+        # waiting for the background flusher and the post concurrency limit
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._embed_queue: Optional[asyncio.Queue] = None
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._post_semaphore: Optional[asyncio.Semaphore] = None
+        # Embeds the flusher has taken off the queue but not yet posted
+        self._inflight_embeds: List[Dict[str, Any]] = []
+        self.dropped_notifications = 0
+        self._last_drop_log = float('-inf')
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared webhook HTTP client"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=5.0,
+                limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60)
+            )
+        return self._client
+    
+    async def _bind_loop(self):
+        """Create the queue and semaphore on the running loop
         
-    async def send_webhook_notification(self, error_data: Dict[str, Any]) -> bool:
-        """Send error notification via Discord webhook"""
-        if not self.webhook_url:
-            return False
+        The bot may be restarted on a new event loop in the same process, and
+        asyncio primitives from the old loop cannot be awaited on the new one.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._embed_queue = asyncio.Queue(maxsize=EMBED_QUEUE_SIZE)
+        self._post_semaphore = asyncio.Semaphore(WEBHOOK_CONCURRENCY)
+        self._flusher_task = None
+        
+        # Connections of a client left open on the old loop cannot be reused,
+        # so close it to release its pool before starting a new one
+        old_client, self._client = self._client, None
+        if old_client is not None:
+            try:
+                await old_client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close webhook client from the previous loop: {e}")
+    
+    def queued_notifications(self) -> int:
+        """Get the number of embeds waiting for the flusher"""
+        return self._embed_queue.qsize() if self._embed_queue is not None else 0
+    
+    async def aclose(self):
+        """Post any queued embeds and close the shared webhook HTTP client"""
+        task, self._flusher_task = self._flusher_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
         
+        # Include the batch the flusher had already taken off the queue
+        embeds, self._inflight_embeds = self._inflight_embeds, []
+        while self._embed_queue is not None and not self._embed_queue.empty():
+            embeds.append(self._embed_queue.get_nowait())
         try:
-            # Create embed for error notification
-            embed = {
-                "title": "🔴 Discord AI Selfbot Error",
-                "color": 0xFF0000,  # Red color
-                "timestamp": datetime.utcnow().isoformat(),
-                "fields": [
-                    {
-                        "name": "Error Type",
-                        "value": f"```{error_data.get('error_type', 'Unknown')}```",
-                        "inline": True
-                    },
-                    {
-                        "name": "Severity",
-                        "value": error_data.get('severity', 'Medium'),
-                        "inline": True
-                    },
-                    {
-                        "name": "User ID",
-                        "value": str(error_data.get('user_id', 'N/A')),
-                        "inline": True
-                    },
-                    {
-                        "name": "Channel ID", 
-                        "value": str(error_data.get('channel_id', 'N/A')),
-                        "inline": True
-                    },
-                    {
-                        "name": "Error Message",
-                        "value": f"```{error_data.get('error_message', 'No message')[:1000]}```",
-                        "inline": False
-                    }
-                ],
-                "footer": {
-                    "text": f"Selfbot v3.0.0 • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            for i in range(0, len(embeds), WEBHOOK_MAX_EMBEDS):
+                await self._post_embeds(embeds[i:i + WEBHOOK_MAX_EMBEDS])
+        except Exception as e:
+            logger.error(f"Failed to send queued webhook notifications: {e}")
+        
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    @staticmethod
+    def _build_embed(error_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the webhook embed for one error"""
+        # Create embed for error notification
+        now = datetime.utcnow()
+        embed = {
+            "title": _EMBED_TITLE,
+            "color": _EMBED_COLOR,
+            "timestamp": now.isoformat(),
+            "fields": [
+                {
+                    "name": name,
+                    "value": f"```{str(error_data.get(key, default))[:limit]}```" if code else str(error_data.get(key, default)),
+                    "inline": inline
                 }
+                for name, key, default, code, limit, inline in _EMBED_FIELDS
+            ],
+            "footer": {
+                "text": f"{_FOOTER_PREFIX}{now:%Y-%m-%d %H:%M:%S} UTC"
             }
+        }
+        
+        # Add stack trace if available (truncated)
+        stack_trace = error_data.get('stack_trace')
+        if stack_trace:
+            truncated = stack_trace[:800]
+            embed["fields"].append({
+                "name": "Stack Trace (Truncated)",
+                "value": f"```python\n{truncated}{'...' if len(truncated) < len(stack_trace) else ''}```",
+                "inline": False
+            })
+        
+        return embed
+    
+    async def _post_embeds(self, embeds: List[Dict[str, Any]]) -> Tuple[bool, float]:
+        """Post embeds in a single webhook message
+        
+        Returns whether the post succeeded and the number of seconds Discord
+        asked us to wait before the next post (0.0 unless it answered 429).
+        """
+        await self._bind_loop()
+        payload = {
+            "embeds": embeds,
+            "username": "Selfbot Error Reporter"
+        }
+        
+        # Send webhook with timeout
+        async with self._post_semaphore:
+            response = await self._get_client().post(
+                self.webhook_url,
+                content=_json_dumps(payload),
+                headers={"Content-Type": "application/json"}
+            )
+        
+        if response.status_code == 204:
+            logger.info(f"Error notification sent successfully via webhook ({len(embeds)} embeds)")
+            return True, 0.0
+        
+        if response.status_code == 429:
+            # Prefer the header, which needs no body parsing
+            try:
+                retry_after = float(response.headers["Retry-After"])
+            except (KeyError, ValueError):
+                try:
+                    retry_after = float(response.json().get("retry_after", 1.0))
+                except ValueError:
+                    retry_after = 1.0
+            logger.warning(f"Webhook rate limited, retry after {retry_after}s")
+            return False, retry_after
+        
+        logger.warning(f"Webhook returned status {response.status_code}")
+        return False, 0.0
+    
+    async def _post_with_retry(self, embeds: List[Dict[str, Any]]) -> bool:
+        """Post embeds, waiting out rate limits for up to MAX_WEBHOOK_RETRIES attempts"""
+        for _ in range(MAX_WEBHOOK_RETRIES):
+            sent, retry_after = await self._post_embeds(embeds)
+            if not retry_after:
+                return sent
+            await asyncio.sleep(retry_after)
+        return False
+    
+    async def _flush_loop(self):
+        """Post queued embeds, coalescing those that arrive within the batch window"""
+        loop = asyncio.get_running_loop()
+        while True:
+            embeds = self._inflight_embeds = [await self._embed_queue.get()]
+            deadline = loop.time() + EMBED_BATCH_WINDOW
+            while len(embeds) < WEBHOOK_MAX_EMBEDS:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    embeds.append(await asyncio.wait_for(self._embed_queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
             
-            # Add stack trace if available (truncated)
-            stack_trace = error_data.get('stack_trace')
-            if stack_trace:
-                embed["fields"].append({
-                    "name": "Stack Trace (Truncated)",
-                    "value": f"```python\n{stack_trace[:800]}{'...' if len(stack_trace) > 800 else ''}```",
-                    "inline": False
-                })
+            try:
+                await self._post_with_retry(embeds)
+            except Exception as e:
+                logger.error(f"Failed to send webhook notification: {e}")
+            self._inflight_embeds = []
+    
+    @staticmethod
+    def _on_flusher_done(task: asyncio.Task):
+        """Log a crashed flusher; the next queued notification starts a new one"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Webhook flusher stopped: {task.exception()}")
+    
+    async def send_webhook_notification(self, error_data: Dict[str, Any]) -> bool:
+        """Queue an error notification for the webhook
+        
+        Only builds the embed and enqueues it; the HTTP post happens in the
+        background flusher, so callers never wait on the webhook.
+        """
+        if not self.webhook_url:
+            return False
+        
+        try:
+            await self._bind_loop()
+            if self._flusher_task is None or self._flusher_task.done():
+                self._flusher_task = asyncio.create_task(self._flush_loop())
+                self._flusher_task.add_done_callback(self._on_flusher_done)
             
-            payload = {
-                "embeds": [embed],
-                "username": "Selfbot Error Reporter"
-            }
+            self._embed_queue.put_nowait(self._build_embed(error_data))
+            return True
             
-            # Send webhook with timeout
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    self.webhook_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                )
-                
-                if response.status_code == 204:
-                    logger.info("Error notification sent successfully via webhook")
-                    return True
-                else:
-                    logger.warning(f"Webhook returned status {response.status_code}")
-                    return False
-                    
+        except asyncio.QueueFull:
+            # Drop rather than block the caller, warning at most once per interval
+            self.dropped_notifications += 1
+            now = time.monotonic()
+            if now - self._last_drop_log >= DROP_LOG_INTERVAL:
+                self._last_drop_log = now
+                logger.warning(f"Webhook notification queue is full, {self.dropped_notifications} notifications dropped so far")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to queue webhook notification: {e}")
+            return False
+    
+    async def send_webhook_now(self, error_data: Dict[str, Any]) -> bool:
+        """Send an error notification immediately, bypassing the queue"""
+        if not self.webhook_url:
+            return False
+        
+        try:
+            return await self._post_with_retry([self._build_embed(error_data)])
         except Exception as e:
             logger.error(f"Failed to send webhook notification: {e}")
             return False
     
     def should_notify(self, error_type: str, error_message: str) -> bool:
         """Determine if we should send notification based on rate limiting"""
-        current_time = time.time()
-        error_key = f"{error_type}:{hash(error_message) % 10000}"
+        now = time.monotonic()
+        # CRC32 is stable across restarts, unlike hash(), and rarely collides
+        error_key = f"{error_type}:{zlib.crc32(error_message.encode('utf-8', 'replace')):08x}"
         
-        # Update error count
-        if error_key not in self.error_counts:
-            self.error_counts[error_key] = 0
-        self.error_counts[error_key] += 1
+        self.total_errors += 1
+        minute = int(now // 60)
+        ring = self._rings.get(error_key)
+        if ring is None:
+            ring = self._rings[error_key] = BucketRing(minute)
+        recent = ring.add(minute)
         
-        # Check if we've seen this error recently
-        if error_key in self.last_error_times:
-            time_since_last = current_time - self.last_error_times[error_key]
-            
-            # Rate limit: Don't notify for same error within 5 minutes
-            if time_since_last < 300:  # 5 minutes
-                return False
-            
-            # If error is happening frequently (>5 times in 1 hour), reduce notifications
-            if self.error_counts[error_key] > 5 and time_since_last < 3600:  # 1 hour
-                # Only notify every 30 minutes for frequent errors
-                return time_since_last > 1800  # 30 minutes
+        if now - self._last_sweep > NOTIFY_SWEEP_INTERVAL:
+            self._sweep(now)
         
-        self.last_error_times[error_key] = current_time
-        return True
+        # Refill the bucket for the time since it was last used, more slowly
+        # for errors that keep recurring
+        refill = FREQUENT_REFILL_SECONDS if recent > FREQUENT_ERROR_THRESHOLD else NOTIFY_REFILL_SECONDS
+        tokens, last = self._buckets.get(error_key, (NOTIFY_BURST, now))
+        tokens = min(NOTIFY_BURST, tokens + (now - last) / refill)
+        allowed = tokens >= 1
+        self._buckets[error_key] = (tokens - 1 if allowed else tokens, now)
+        self._buckets.move_to_end(error_key)
+        
+        if len(self._buckets) > MAX_TRACKED_ERRORS:
+            evicted, _ = self._buckets.popitem(last=False)
+            self._rings.pop(evicted, None)
+        
+        return allowed
+    
+    def error_counts(self) -> Dict[str, int]:
+        """Get the number of errors per key over the last hour"""
+        minute = int(time.monotonic() // 60)
+        return {key: ring.count(minute) for key, ring in self._rings.items()}
+    
+    def _sweep(self, now: float):
+        """Forget error keys that have not been seen for NOTIFY_IDLE_EXPIRY seconds"""
+        cutoff = now - NOTIFY_IDLE_EXPIRY
+        # Buckets are kept in order of last use, so expired keys are at the front
+        while self._buckets:
+            key, (_, last) = next(iter(self._buckets.items()))
+            if last >= cutoff:
+                break
+            del self._buckets[key]
+            self._rings.pop(key, None)
+        self._last_sweep = now
     
     def get_error_severity(self, error_type: str, error_message: str) -> str:
         """Determine error severity level"""
-        error_lower = error_message.lower()
-        
-        # Critical errors
-        if any(keyword in error_lower for keyword in [
-            'token', 'unauthorized', 'forbidden', 'authentication',
-            'database', 'corruption', 'segmentation fault'
-        ]):
-            return "🔴 Critical"
-        
-        # High severity
-        elif any(keyword in error_lower for keyword in [
-            'rate limit', 'quota', 'api', 'connection', 'timeout'
-        ]):
-            return "🟠 High"
-        
-        # Medium severity  
-        elif any(keyword in error_lower for keyword in [
-            'permission', 'missing', 'not found', 'invalid'
-        ]):
-            return "🟡 Medium"
-        
-        # Low severity
-        else:
-            return "🟢 Low"
+        return _classify_severity(error_message)
 
 # Global error notification manager
 _error_manager = ErrorNotificationManager()
 
+def _error_details(error: Any) -> Tuple[str, str, Optional[str]]:
+    """Get the type name, message and stack trace of an error"""
+    if isinstance(error, Exception):
+        # Format the error's own traceback; it need not be the exception being handled
+        stack_trace = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+        return type(error).__name__, str(error), stack_trace
+    return "GeneralError", str(error), None
+
+def _record_error(message: Optional[discord.Message], error: Any) -> Dict[str, Any]:
+    """Extract error details, log them to the database and return the error data"""
+    error_type, error_message, stack_trace = _error_details(error)
+    
+    # Prepare error data
+    error_data = {
+        "error_type": error_type,
+        "error_message": error_message,
+        "stack_trace": stack_trace,
+        "user_id": message.author.id if message else None,
+        "channel_id": message.channel.id if message else None,
+        "username": message.author.name if message else None,
+        "guild_id": message.guild.id if message and message.guild else None,
+        "severity": _error_manager.get_error_severity(error_type, error_message)
+    }
+    
+    # Log to database
+    log_error(
+        error_type=error_type,
+        error_message=error_message,
+        stack_trace=stack_trace,
+        user_id=error_data.get("user_id"),
+        channel_id=error_data.get("channel_id")
+    )
+    
+    return error_data
+
+async def close_notifications():
+    """Close the webhook HTTP client on shutdown"""
+    await _error_manager.aclose()
+
 async def webhook_log(message: discord.Message, error: Any) -> bool:
     """Log error with webhook notification support"""
     try:
-        # Extract error information
-        if isinstance(error, Exception):
-            error_type = type(error).__name__
-            error_message = str(error)
-            stack_trace = traceback.format_exc()
-        else:
-            error_type = "GeneralError"
-            error_message = str(error)
-            stack_trace = None
-        
-        # Prepare error data
-        error_data = {
-            "error_type": error_type,
-            "error_message": error_message,
-            "stack_trace": stack_trace,
-            "user_id": message.author.id if message else None,
-            "channel_id": message.channel.id if message else None,
-            "username": message.author.name if message else None,
-            "guild_id": message.guild.id if message and message.guild else None,
-            "severity": _error_manager.get_error_severity(error_type, error_message),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        # Without a webhook only the database record and error counts are needed
+        if not _error_manager._enabled:
+            error_type, error_message, stack_trace = _error_details(error)
+            log_error(
+                error_type=error_type,
+                error_message=error_message,
+                stack_trace=stack_trace,
+                user_id=message.author.id if message else None,
+                channel_id=message.channel.id if message else None
+            )
+            _error_manager.should_notify(error_type, error_message)
+            return False
         
-        # Log to database
-        log_error(
-            error_type=error_type,
-            error_message=error_message,
-            stack_trace=stack_trace,
-            user_id=error_data.get("user_id"),
-            channel_id=error_data.get("channel_id")
-        )
+        error_data = _record_error(message, error)
+        error_type = error_data["error_type"]
         
         # Check if we should send webhook notification
-        if _error_manager.should_notify(error_type, error_message):
+        if _error_manager.should_notify(error_type, error_data["error_message"]):
             webhook_sent = await _error_manager.send_webhook_notification(error_data)
             
             if webhook_sent:
-                logger.info(f"Error notification sent for {error_type}")
+                logger.info(f"Error notification queued for {error_type}")
             else:
-                logger.warning(f"Failed to send error notification for {error_type}")
+                logger.warning(f"Failed to queue error notification for {error_type}")
             
             return webhook_sent
         else:
@@ -212,6 +492,26 @@ async def webhook_log(message: discord.Message, error: Any) -> bool:
         logger.error(f"Error in webhook_log function: {e}")
         return False
 
+async def webhook_log_batch(events: List[Tuple[Optional[discord.Message], Any]]) -> int:
+    """Log several (message, error) events and queue their webhook notifications
+    
+    Notifications go through the same queue as webhook_log, whose flusher
+    posts them in batches and handles rate limits. Returns how many were queued.
+    """
+    try:
+        queued = 0
+        for message, error in events:
+            error_data = _record_error(message, error)
+            if _error_manager.should_notify(error_data["error_type"], error_data["error_message"]):
+                if await _error_manager.send_webhook_notification(error_data):
+                    queued += 1
+        
+        return queued
+        
+    except Exception as e:
+        logger.error(f"Error in webhook_log_batch function: {e}")
+        return 0
+
 async def log_startup_event(bot_user: discord.User) -> bool:
     """Log bot startup event"""
     try:
@@ -224,7 +524,6 @@ async def log_startup_event(bot_user: discord.User) -> bool:
         }
         
         # Only send if startup notifications are enabled
-        from .helpers import load_config
         config = load_config()
         
         if config.get("notifications", {}).get("startup_notifications", False):
@@ -249,7 +548,6 @@ async def log_rate_limit_event(user_id: int, channel_id: int, retry_after: float
         }
         
         # Check config for rate limit notifications
-        from .helpers import load_config
         config = load_config()
         
         if config.get("notifications", {}).get("ratelimit_notifications", True):
@@ -305,13 +603,15 @@ async def log_ai_error(model_used: str, error_message: str, user_id: int = None,
 def get_error_stats() -> Dict[str, Any]:
     """Get error statistics"""
     try:
+        error_counts = _error_manager.error_counts()
         return {
-            "total_error_types": len(_error_manager.error_counts),
-            "total_errors": sum(_error_manager.error_counts.values()),
-            "recent_errors": len([t for t in _error_manager.last_error_times.values() 
-                                if time.time() - t < 3600]),  # Last hour
+            "total_error_types": len(error_counts),
+            "total_errors": _error_manager.total_errors,
+            "recent_errors": sum(error_counts.values()),  # Last hour
             "webhook_configured": bool(_error_manager.webhook_url),
-            "most_common_errors": sorted(_error_manager.error_counts.items(), 
+            "queued_notifications": _error_manager.queued_notifications(),
+            "dropped_notifications": _error_manager.dropped_notifications,
+            "most_common_errors": sorted(error_counts.items(), 
                                        key=lambda x: x[1], reverse=True)[:5]
         }
     except Exception as e:
@@ -328,7 +628,7 @@ async def test_webhook() -> bool:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        return await _error_manager.send_webhook_notification(test_data)
+        return await _error_manager.send_webhook_now(test_data)
         
     except Exception as e:
         logger.error(f"Error testing webhook: {e}")
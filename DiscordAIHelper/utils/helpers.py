@@ -4,15 +4,50 @@ Enhanced for 2025 with better error handling and modern Python practices
 """
 
 import os
+import re
 import sys
+import copy
 import yaml
 import platform
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
 
+# Prefer the libyaml-backed loader and dumper when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
 logger = logging.getLogger(__name__)
 
+# Base directory for resources: PyInstaller creates a temp folder and stores
+# its path in _MEIPASS, otherwise resources are relative to the working directory
+_BASE_PATH = getattr(sys, "_MEIPASS", None) or os.path.abspath(".")
+
+# Last instructions read from disk, keyed by the file's (mtime_ns, size)
+_instructions_cache: Optional[Tuple[Tuple[int, int], str]] = None
+
+# Classic user token format: an ID segment of 20+ characters followed by two
+# dot-separated parts. The modern dotless formats (including the MTA/MTU/Nz/OD
+# prefixed ones) all need 50+ characters, which the length check accepts anyway.
+_CLASSIC_TOKEN_RE = re.compile(r'[A-Za-z0-9_-]{20,}\..*\.')
+
+# Units used by format_file_size, in powers of 1024
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
+
+# Config keys that must be present (and not null), as paths into the parsed YAML
+_REQUIRED_CONFIG_FIELDS = (
+    ("bot", "owner_id"),
+    ("bot", "prefix"),
+    ("bot", "trigger"),
+    ("bot", "groq_model"),
+)
+
+# Last parsed config (with defaults applied), keyed by the file's mtime and size
+_config_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
 def clear_console():
     """Clear the console screen cross-platform"""
     try:
@@ -24,46 +59,40 @@ def clear_console():
         # Fallback: print newlines
         print("\n" * 50)
 
+@lru_cache(maxsize=32)
 def resource_path(relative_path: str) -> str:
     """Get absolute path to resource, works for dev and for PyInstaller"""
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except AttributeError:
-        base_path = os.path.abspath(".")
-    
-    return os.path.join(base_path, relative_path)
+    return os.path.join(_BASE_PATH, relative_path)
 
 def get_env_path() -> str:
     """Get path to .env file"""
     return resource_path("config/.env")
 
 def load_config() -> Dict[str, Any]:
-    """Load configuration from YAML file with enhanced error handling"""
+    """Load configuration from YAML file with enhanced error handling
+    
+    The parsed config is cached and only re-read when the file's modification
+    time or size changes. Each caller gets its own copy, since callers modify it.
+    """
+    global _config_cache
     config_path = resource_path("config/config.yaml")
     
     try:
+        st = os.stat(config_path)
+        cache_key = (st.st_mtime_ns, st.st_size)
+        if _config_cache is not None and _config_cache[0] == cache_key:
+            return copy.deepcopy(_config_cache[1])
+        
         with open(config_path, 'r', encoding='utf-8') as file:
-            config = yaml.safe_load(file)
+            config = yaml.load(file, Loader=SafeLoader)
         
         # Validate required fields
-        required_fields = [
-            "bot.owner_id",
-            "bot.prefix", 
-            "bot.trigger",
-            "bot.groq_model"
-        ]
-        
-        for field in required_fields:
-            keys = field.split('.')
+        for path in _REQUIRED_CONFIG_FIELDS:
             value = config
-            try:
-                for key in keys:
-                    value = value[key]
-                if value is None:
-                    raise ValueError(f"Required field {field} is None")
-            except (KeyError, TypeError):
-                raise ValueError(f"Required field {field} is missing from config")
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                raise ValueError(f"Required field {'.'.join(path)} is missing from config")
         
         # Set defaults for new fields
         config.setdefault("security", {})
@@ -138,8 +167,9 @@ def load_config() -> Dict[str, Any]:
         advanced_config.setdefault("topic_detection", False)
         advanced_config.setdefault("multilingual_support", False)
         
+        _config_cache = (cache_key, config)
         logger.info("Configuration loaded successfully")
-        return config
+        return copy.deepcopy(config)
         
     except FileNotFoundError:
         logger.error(f"Configuration file not found: {config_path}")
@@ -151,11 +181,30 @@ def load_config() -> Dict[str, Any]:
         logger.error(f"Unexpected error loading configuration: {e}")
         raise
 
+def invalidate_instructions_cache():
+    """Forget the cached instructions after the file is rewritten
+    
+    The mtime may not change within the clock's resolution, so writers call
+    this rather than relying on the cache key alone.
+    """
+    global _instructions_cache
+    _instructions_cache = None
+
 def load_instructions() -> str:
-    """Load AI instructions from file with fallback"""
+    """Load AI instructions from file with fallback
+    
+    The parsed text is cached in-process and only re-read when the file's
+    modification time or size changes, or after invalidate_instructions_cache.
+    """
+    global _instructions_cache
     instructions_path = resource_path("config/instructions.txt")
     
     try:
+        st = os.stat(instructions_path)
+        cache_key = (st.st_mtime_ns, st.st_size)
+        if _instructions_cache is not None and _instructions_cache[0] == cache_key:
+            return _instructions_cache[1]
+        
         with open(instructions_path, 'r', encoding='utf-8') as file:
             instructions = file.read().strip()
         
@@ -163,6 +212,7 @@ def load_instructions() -> str:
             logger.warning("Instructions file is empty, using default")
             return get_default_instructions()
         
+        _instructions_cache = (cache_key, instructions)
         logger.info("AI instructions loaded successfully")
         return instructions
         
@@ -188,9 +238,16 @@ def save_config(config: Dict[str, Any]) -> bool:
             import shutil
             shutil.copy2(config_path, backup_path)
         
+        # Serialize before opening the file, so a failed dump can't leave it truncated
+        text = yaml.dump(config, Dumper=SafeDumper, default_flow_style=False, indent=2)
+        
         # Save new config
         with open(config_path, 'w', encoding='utf-8') as file:
-            yaml.dump(config, file, default_flow_style=False, indent=2)
+            file.write(text)
+        
+        # Don't rely on the mtime alone; it may not change within the clock's resolution
+        global _config_cache
+        _config_cache = None
         
         logger.info("Configuration saved successfully")
         return True
@@ -220,57 +277,40 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB"]
-    import math
-    i = int(math.floor(math.log(size_bytes, 1024)))
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 2)
-    return f"{s} {size_names[i]}"
+    # Each unit is 2**10 times the previous, so the bit length picks the unit
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    s = round(size_bytes / (1 << (i * 10)), 2)
+    return f"{s} {_SIZE_UNITS[i]}"
 
 def validate_discord_token(token: str) -> bool:
     """Enhanced Discord token validation for 2025"""
-    if not token or len(token.strip()) == 0:
+    token = token.strip() if token else ""
+    if not token:
         return False
     
-    token = token.strip()
-    
     # Skip validation for placeholder values
     if token == "your_discord_token_here":
         return False
     
-    # Enhanced validation - User tokens can have different formats
-    import re
-    
-    # Modern user token patterns (more flexible for 2025)
-    patterns = [
-        r'^[A-Za-z0-9_-]{20,}\..*\..*',  # Classic format with dots
-        r'^[A-Za-z0-9_-]{50,}$',        # Modern format without dots
-        r'^MTA[A-Za-z0-9_-]{50,}$',     # User token starting with MTA
-        r'^MTU[A-Za-z0-9_-]{50,}$',     # User token starting with MTU
-        r'^Nz[A-Za-z0-9_-]{50,}$',      # User token starting with Nz
-        r'^OD[A-Za-z0-9_-]{50,}$',      # User token starting with OD
-    ]
-    
-    # Check if token matches any valid pattern
-    for pattern in patterns:
-        if re.match(pattern, token):
-            return True
+    # Any token of 50+ characters is accepted, which covers the modern formats
+    # and new ones Discord might introduce
+    if len(token) >= 50:
+        return True
     
-    # If no pattern matches but token is long enough, accept it
-    # This handles edge cases and new formats Discord might introduce
-    return len(token) >= 50
+    # Shorter tokens must be in the classic dotted format
+    return len(token) >= 22 and _CLASSIC_TOKEN_RE.match(token) is not None
 
 def validate_api_key(api_key: str, service: str = "groq") -> bool:
     """Validate API key format"""
-    if not api_key or len(api_key.strip()) == 0:
+    api_key = api_key.strip() if api_key else ""
+    if not api_key:
         return False
     
-    api_key = api_key.strip()
-    
-    if service.lower() == "groq":
+    service = service.lower()
+    if service == "groq":
         # Groq API keys typically start with "gsk_"
         return api_key.startswith("gsk_") and len(api_key) > 20
-    elif service.lower() == "openai":
+    elif service == "openai":
         # OpenAI API keys typically start with "sk-"
         return api_key.startswith("sk-") and len(api_key) > 20
     
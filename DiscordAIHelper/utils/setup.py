@@ -5,6 +5,7 @@ Enhanced configuration wizard for 2025
 
 import os
 import sys
+import copy
 import getpass
 from pathlib import Path
 from colorama import Fore, Style, init
@@ -13,9 +14,89 @@ import logging
 
 from .helpers import resource_path, save_config, validate_discord_token, validate_api_key
 
-init()
+# Strip the color codes when the wizard's output isn't going to a terminal
+init(strip=not (sys.stdout is not None and sys.stdout.isatty()))
 logger = logging.getLogger(__name__)
 
+# Directory the wizard writes its files to
+_CONFIG_DIR = Path(resource_path("config"))
+
+# Bot settings asked for by get_bot_settings, with their prompts
+_BOT_SETTING_PROMPTS = (
+    ("realistic_typing", "Enable realistic typing delays?"),
+    ("allow_dm", "Respond to direct messages?"),
+    ("allow_gc", "Respond in group chats?"),
+    ("hold_conversation", "Continue conversations without triggers?"),
+    ("anti_age_ban", "Enable anti-age ban protection?"),
+)
+
+# Template for the generated config.yaml; owner_id and trigger come from the wizard
+_DEFAULT_CONFIG = {
+    "bot": {
+        "owner_id": None,
+        "prefix": "~",
+        "trigger": "",
+        "groq_model": "llama-3.3-70b-versatile",  # Updated model
+        "openai_model": "gpt-4o",  # Latest OpenAI model
+        "allow_dm": True,
+        "allow_gc": True,
+        "reply_ping": True,
+        "realistic_typing": True,
+        "batch_messages": True,
+        "batch_wait_time": 8.0,
+        "hold_conversation": True,
+        "anti_age_ban": True,
+        "disable_mentions": True,
+        "help_command_enabled": True,
+        "max_messages_per_minute": 10,
+        "cooldown_duration": 60,
+        "conversation_timeout": 300
+    },
+    "security": {
+        "random_delays": True,
+        "typing_variation": True,
+        "message_variation": True,
+        "adaptive_cooldowns": True,
+        "smart_batching": True,
+        "detailed_logging": True,
+        "error_tracking": True
+    },
+    "ai": {
+        "max_response_length": 2000,
+        "context_window": 20,
+        "temperature": 0.7,
+        "content_filter": True,
+        "profanity_filter": False,
+        "groq_settings": {
+            "max_tokens": 1024,
+            "top_p": 0.9,
+            "frequency_penalty": 0.0,
+            "presence_penalty": 0.0
+        },
+        "openai_settings": {
+            "max_tokens": 1024,
+            "top_p": 0.9,
+            "frequency_penalty": 0.0,
+            "presence_penalty": 0.0
+        }
+    },
+    "notifications": {
+        "error_webhook": "",
+        "ratelimit_notifications": True,
+        "error_notifications": True,
+        "startup_notifications": False
+    },
+    "advanced": {
+        "conversation_memory": True,
+        "user_preferences": True,
+        "message_caching": True,
+        "response_caching": False,
+        "sentiment_analysis": False,
+        "topic_detection": False,
+        "multilingual_support": False
+    }
+}
+
 def print_banner():
     """Print setup banner"""
     print(f"{Fore.CYAN}╔══════════════════════════════════════════════════════════════╗")
@@ -106,88 +187,79 @@ def get_api_keys() -> Dict[str, str]:
     print("• Groq: Free tier available (Recommended)")
     print("• OpenAI: Paid service\n")
     
-    api_keys = {}
-    
-    # Groq API Key
-    print(f"{Fore.CYAN}Groq API Key (Recommended){Style.RESET_ALL}")
-    print("Get free API key from: https://console.groq.com/keys")
-    groq_key = input(f"{Fore.CYAN}Enter Groq API key (or press Enter to skip): {Style.RESET_ALL}").strip()
-    
-    if groq_key and validate_api_key(groq_key, "groq"):
-        api_keys["GROQ_API_KEY"] = groq_key
-        print(f"{Fore.GREEN}✓ Valid Groq API key{Style.RESET_ALL}")
-    elif groq_key:
-        print(f"{Fore.YELLOW}⚠ Invalid Groq API key format, skipping{Style.RESET_ALL}")
-    
-    # OpenAI API Key
-    print(f"\n{Fore.CYAN}OpenAI API Key (Optional){Style.RESET_ALL}")
-    print("Get API key from: https://platform.openai.com/api-keys")
-    openai_key = input(f"{Fore.CYAN}Enter OpenAI API key (or press Enter to skip): {Style.RESET_ALL}").strip()
-    
-    if openai_key and validate_api_key(openai_key, "openai"):
-        api_keys["OPENAI_API_KEY"] = openai_key
-        print(f"{Fore.GREEN}✓ Valid OpenAI API key{Style.RESET_ALL}")
-    elif openai_key:
-        print(f"{Fore.YELLOW}⚠ Invalid OpenAI API key format, skipping{Style.RESET_ALL}")
-    
-    if not api_keys:
-        print(f"{Fore.RED}Error: You need at least one valid API key to continue!{Style.RESET_ALL}")
-        return get_api_keys()  # Retry
-    
-    return api_keys
+    while True:
+        api_keys = {}
+        
+        # Groq API Key
+        print(f"{Fore.CYAN}Groq API Key (Recommended){Style.RESET_ALL}")
+        print("Get free API key from: https://console.groq.com/keys")
+        groq_key = input(f"{Fore.CYAN}Enter Groq API key (or press Enter to skip): {Style.RESET_ALL}").strip()
+        
+        if groq_key and validate_api_key(groq_key, "groq"):
+            api_keys["GROQ_API_KEY"] = groq_key
+            print(f"{Fore.GREEN}✓ Valid Groq API key{Style.RESET_ALL}")
+        elif groq_key:
+            print(f"{Fore.YELLOW}⚠ Invalid Groq API key format, skipping{Style.RESET_ALL}")
+        
+        # OpenAI API Key
+        print(f"\n{Fore.CYAN}OpenAI API Key (Optional){Style.RESET_ALL}")
+        print("Get API key from: https://platform.openai.com/api-keys")
+        openai_key = input(f"{Fore.CYAN}Enter OpenAI API key (or press Enter to skip): {Style.RESET_ALL}").strip()
+        
+        if openai_key and validate_api_key(openai_key, "openai"):
+            api_keys["OPENAI_API_KEY"] = openai_key
+            print(f"{Fore.GREEN}✓ Valid OpenAI API key{Style.RESET_ALL}")
+        elif openai_key:
+            print(f"{Fore.YELLOW}⚠ Invalid OpenAI API key format, skipping{Style.RESET_ALL}")
+        
+        if api_keys:
+            return api_keys
+        
+        # Ask again without repeating the intro
+        print(f"{Fore.RED}Error: You need at least one valid API key to continue!{Style.RESET_ALL}\n")
 
 def get_bot_settings() -> Dict[str, Any]:
     """Get bot behavior settings"""
     print(f"\n{Fore.GREEN}⚙️ Bot Behavior Settings{Style.RESET_ALL}")
     
-    settings = {}
-    
-    # Realistic typing
-    response = input(f"{Fore.CYAN}Enable realistic typing delays? (y/n) [default: y]: {Style.RESET_ALL}").strip().lower()
-    settings["realistic_typing"] = response != 'n'
+    # All settings default to enabled, so they can be accepted in one go
+    print("Defaults: realistic typing, DM and group chat replies, conversation holding")
+    print("and anti-age ban protection are all enabled")
+    response = input(f"{Fore.CYAN}Use the defaults? (y/n) [default: y]: {Style.RESET_ALL}").strip().lower()
+    if response != 'n':
+        return {key: True for key, _ in _BOT_SETTING_PROMPTS}
     
-    # DM responses
-    response = input(f"{Fore.CYAN}Respond to direct messages? (y/n) [default: y]: {Style.RESET_ALL}").strip().lower()
-    settings["allow_dm"] = response != 'n'
-    
-    # Group chat responses
-    response = input(f"{Fore.CYAN}Respond in group chats? (y/n) [default: y]: {Style.RESET_ALL}").strip().lower()
-    settings["allow_gc"] = response != 'n'
-    
-    # Conversation holding
-    response = input(f"{Fore.CYAN}Continue conversations without triggers? (y/n) [default: y]: {Style.RESET_ALL}").strip().lower()
-    settings["hold_conversation"] = response != 'n'
-    
-    # Anti-age ban
-    response = input(f"{Fore.CYAN}Enable anti-age ban protection? (y/n) [default: y]: {Style.RESET_ALL}").strip().lower()
-    settings["anti_age_ban"] = response != 'n'
+    settings = {}
+    for key, question in _BOT_SETTING_PROMPTS:
+        response = input(f"{Fore.CYAN}{question} (y/n) [default: y]: {Style.RESET_ALL}").strip().lower()
+        settings[key] = response != 'n'
     
     return settings
 
 def create_env_file(api_keys: Dict[str, str], token: str) -> bool:
     """Create .env file"""
     try:
-        env_path = resource_path("config/.env")
-        os.makedirs(os.path.dirname(env_path), exist_ok=True)
+        lines = [
+            "# Discord AI Selfbot Environment Configuration - 2025 Edition\n",
+            "# Generated by setup wizard\n\n",
+            "# Discord Token (Required)\n",
+            f"DISCORD_TOKEN={token}\n\n",
+        ]
+        lines.extend(
+            f"# {key.split('_')[0].title()} API Key\n{key}={value}\n\n"
+            for key, value in api_keys.items()
+        )
+        # Optional settings with defaults
+        lines.append(
+            "# Optional Configuration\n"
+            "ERROR_WEBHOOK_URL=\n"
+            "DATABASE_URL=sqlite:///selfbot.db\n"
+            "LOG_LEVEL=INFO\n"
+            "LOG_FILE=selfbot.log\n"
+        )
         
-        with open(env_path, 'w') as f:
-            f.write("# Discord AI Selfbot Environment Configuration - 2025 Edition\n")
-            f.write("# Generated by setup wizard\n\n")
-            
-            f.write("# Discord Token (Required)\n")
-            f.write(f"DISCORD_TOKEN={token}\n\n")
-            
-            for key, value in api_keys.items():
-                service = key.split('_')[0].title()
-                f.write(f"# {service} API Key\n")
-                f.write(f"{key}={value}\n\n")
-            
-            # Optional settings with defaults
-            f.write("# Optional Configuration\n")
-            f.write("ERROR_WEBHOOK_URL=\n")
-            f.write("DATABASE_URL=sqlite:///selfbot.db\n")
-            f.write("LOG_LEVEL=INFO\n")
-            f.write("LOG_FILE=selfbot.log\n")
+        with open(_CONFIG_DIR / ".env", 'w') as f:
+            f.write("".join(lines))
         
         print(f"{Fore.GREEN}✓ Environment file created successfully{Style.RESET_ALL}")
         return True
@@ -199,71 +271,13 @@ def create_env_file(api_keys: Dict[str, str], token: str) -> bool:
 def create_config_file(owner_id: int, trigger: str, settings: Dict[str, Any]) -> bool:
     """Create config.yaml file"""
     try:
-        config = {
-            "bot": {
-                "owner_id": owner_id,
-                "prefix": "~",
-                "trigger": trigger,
-                "groq_model": "llama-3.3-70b-versatile",  # Updated model
-                "openai_model": "gpt-4o",  # Latest OpenAI model
-                "allow_dm": settings.get("allow_dm", True),
-                "allow_gc": settings.get("allow_gc", True),
-                "reply_ping": True,
-                "realistic_typing": settings.get("realistic_typing", True),
-                "batch_messages": True,
-                "batch_wait_time": 8.0,
-                "hold_conversation": settings.get("hold_conversation", True),
-                "anti_age_ban": settings.get("anti_age_ban", True),
-                "disable_mentions": True,
-                "help_command_enabled": True,
-                "max_messages_per_minute": 10,
-                "cooldown_duration": 60,
-                "conversation_timeout": 300
-            },
-            "security": {
-                "random_delays": True,
-                "typing_variation": True,
-                "message_variation": True,
-                "adaptive_cooldowns": True,
-                "smart_batching": True,
-                "detailed_logging": True,
-                "error_tracking": True
-            },
-            "ai": {
-                "max_response_length": 2000,
-                "context_window": 20,
-                "temperature": 0.7,
-                "content_filter": True,
-                "profanity_filter": False,
-                "groq_settings": {
-                    "max_tokens": 1024,
-                    "top_p": 0.9,
-                    "frequency_penalty": 0.0,
-                    "presence_penalty": 0.0
-                },
-                "openai_settings": {
-                    "max_tokens": 1024,
-                    "top_p": 0.9,
-                    "frequency_penalty": 0.0,
-                    "presence_penalty": 0.0
-                }
-            },
-            "notifications": {
-                "error_webhook": "",
-                "ratelimit_notifications": True,
-                "error_notifications": True,
-                "startup_notifications": False
-            },
-            "advanced": {
-                "conversation_memory": True,
-                "user_preferences": True,
-                "message_caching": True,
-                "response_caching": False,
-                "sentiment_analysis": False,
-                "topic_detection": False,
-                "multilingual_support": False
-            }
-        }
+        config = copy.deepcopy(_DEFAULT_CONFIG)
+        config["bot"].update({
+            "owner_id": owner_id,
+            "trigger": trigger,
+            # Behavior settings chosen in the wizard
+            **{key: settings[key] for key, _ in _BOT_SETTING_PROMPTS if key in settings}
+        })
         
         if save_config(config):
             print(f"{Fore.GREEN}✓ Configuration file created successfully{Style.RESET_ALL}")
@@ -279,9 +293,6 @@ def create_config_file(owner_id: int, trigger: str, settings: Dict[str, Any]) ->
 def create_instructions_file() -> bool:
     """Create instructions.txt file"""
     try:
-        instructions_path = resource_path("config/instructions.txt")
-        os.makedirs(os.path.dirname(instructions_path), exist_ok=True)
-        
         default_instructions = """You are a helpful, friendly, and engaging AI assistant. You should:
 
 1. Be conversational and natural in your responses
@@ -302,7 +313,7 @@ Additional guidelines:
 - Be authentic and genuine in your interactions
 - Maintain appropriate boundaries and be helpful"""
         
-        with open(instructions_path, 'w', encoding='utf-8') as f:
+        with open(_CONFIG_DIR / "instructions.txt", 'w', encoding='utf-8') as f:
             f.write(default_instructions)
         
         print(f"{Fore.GREEN}✓ Instructions file created successfully{Style.RESET_ALL}")
@@ -328,6 +339,7 @@ def create_config():
         print(f"\n{Fore.GREEN}📁 Creating configuration files...{Style.RESET_ALL}")
         
         # Create files
+        _CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         success = True
         success &= create_env_file(api_keys, token)
         success &= create_config_file(owner_id, trigger, bot_settings)
@@ -350,5 +362,52 @@ def create_config():
         print(f"\n{Fore.RED}❌ Unexpected error during setup: {e}{Style.RESET_ALL}")
         logger.error(f"Setup error: {e}")
 
+def create_config_from_env() -> bool:
+    """Create configuration files from environment variables, without prompting
+    
+    Reads DISCORD_TOKEN, OWNER_ID, TRIGGER, GROQ_API_KEY and OPENAI_API_KEY;
+    bot behavior settings are left at their defaults.
+    """
+    errors = []
+    
+    token = os.environ.get("DISCORD_TOKEN", "").strip()
+    if not validate_discord_token(token):
+        errors.append("DISCORD_TOKEN is missing or invalid")
+    
+    try:
+        owner_id = int(os.environ.get("OWNER_ID", "").strip())
+    except ValueError:
+        owner_id = 0
+    if owner_id <= 0:
+        errors.append("OWNER_ID must be a positive Discord user ID")
+    
+    trigger = os.environ.get("TRIGGER", "").strip()
+    if len(trigger) < 2:
+        errors.append("TRIGGER must be at least 2 characters long")
+    
+    api_keys = {}
+    for env_name, service in (("GROQ_API_KEY", "groq"), ("OPENAI_API_KEY", "openai")):
+        key = os.environ.get(env_name, "").strip()
+        if key and validate_api_key(key, service):
+            api_keys[env_name] = key
+        elif key:
+            print(f"{Fore.YELLOW}⚠ Invalid {env_name} format, skipping{Style.RESET_ALL}")
+    if not api_keys:
+        errors.append("At least one valid GROQ_API_KEY or OPENAI_API_KEY is required")
+    
+    if errors:
+        for error in errors:
+            print(f"{Fore.RED}✗ {error}{Style.RESET_ALL}")
+        return False
+    
+    # Create files
+    _CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    success = create_env_file(api_keys, token)
+    success &= create_config_file(owner_id, trigger, {})
+    success &= create_instructions_file()
+    return success
+
 if __name__ == "__main__":
+    if os.environ.get("DISCORDAI_NONINTERACTIVE"):
+        sys.exit(0 if create_config_from_env() else 1)
     create_config()
@@ -5,13 +5,151 @@ Enhanced for 2025 with better message chunking and formatting
 
 import re
 import logging
-from typing import List
+from typing import Iterator, List
 
 logger = logging.getLogger(__name__)
 
 # Discord message limits
 DISCORD_MAX_LENGTH = 2000
-CHUNK_OVERLAP = 50  # Characters to overlap between chunks for context
+
+# Patterns used on every split, compiled once
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')  # Whitespace after sentence-ending punctuation
+_MULTI_NL_RE = re.compile(r'\n\s*\n\s*\n')  # Three or more newlines
+_MULTI_SP_RE = re.compile(r' +')  # Runs of spaces
+
+def iter_split_response(response: str, max_length: int = DISCORD_MAX_LENGTH) -> Iterator[str]:
+    """
+    Split AI response into Discord-friendly chunks, yielding each chunk as
+    soon as it is final so callers can start sending before splitting ends
+    
+    If splitting fails, the rest of the response is force split instead, so
+    a reply that is already partly sent still gets its remaining text.
+    
+    Args:
+        response: The AI response text to split
+        max_length: Maximum length per chunk (default: Discord's 2000 limit)
+    
+    Yields:
+        Message chunks
+    """
+    emitted = []
+    try:
+        for chunk in _iter_chunks(response, max_length):
+            emitted.append(chunk)
+            yield chunk
+    except Exception as e:
+        logger.error(f"Error splitting response: {e}")
+        # Fallback: simple character-based split of whatever was not yielded yet
+        if not emitted:
+            yield from force_split_response(response, max_length)
+            return
+        rest = response[_emitted_end(response, emitted):].strip()
+        for chunk in force_split_response(rest, max_length) if rest else []:
+            chunk = chunk.strip()
+            if chunk:
+                emitted.append(chunk)
+                yield chunk
+    
+    # Log if response was split
+    if len(emitted) > 1:
+        logger.info(f"Response split into {len(emitted)} chunks")
+
+def _emitted_end(response: str, chunks: List[str]) -> int:
+    """Find where the text of already yielded chunks ends in the response
+    
+    Splitting only drops or rewrites whitespace and commas, so every other
+    character of the chunks appears in the response in the same order.
+    """
+    pos = 0
+    for chunk in chunks:
+        for ch in chunk:
+            if ch != ',' and not ch.isspace():
+                pos = response.index(ch, pos) + 1
+    return pos
+
+def _iter_chunks(response: str, max_length: int) -> Iterator[str]:
+    """Split a response into chunks, without the error fallback"""
+    if not response:
+        return
+    
+    # Most responses fit in one message and need no stripping
+    if len(response) <= max_length and not (response[0].isspace() or response[-1].isspace()):
+        yield response
+        return
+    
+    response = response.strip()
+    if not response:
+        return
+    
+    # If response fits in one message, return as-is
+    if len(response) <= max_length:
+        yield response
+        return
+    
+    # A single paragraph goes straight to sentence splitting
+    if '\n\n' not in response:
+        yield from split_long_paragraph(response, max_length)
+        return
+    
+    emitted = False
+    
+    # Try to split by paragraphs first (double newlines). Chunks are built from
+    # stripped, non-empty paragraphs (or the stripped tail of a split long paragraph), so
+    # they never need stripping again. When a chunk's paragraphs appear in the
+    # response exactly as they will be sent, it is sliced straight out of the
+    # response instead of being joined.
+    current_parts = []
+    current_len = 0
+    span_start = span_end = 0  # Where the chunk's paragraphs sit in the response
+    verbatim = False  # Whether the chunk equals response[span_start:span_end]
+    pos = 0
+    
+    for raw in response.split('\n\n'):
+        raw_start = pos
+        pos += len(raw) + 2
+        paragraph = raw.strip()
+        if not paragraph:
+            continue
+        unchanged = len(paragraph) == len(raw)
+        
+        # Add paragraph to current chunk if it fits
+        if current_len and current_len + len(paragraph) + 2 <= max_length:
+            current_parts.append(paragraph)
+            current_len += len(paragraph) + 2
+            verbatim = verbatim and unchanged and span_end == raw_start - 2
+            span_end = raw_start + len(raw)
+            continue
+        
+        # Save current chunk if it has content
+        if current_len:
+            emitted = True
+            yield response[span_start:span_end] if verbatim else "\n\n".join(current_parts)
+        
+        # If paragraph itself is too long, split it further
+        if len(paragraph) > max_length:
+            sub_chunks = split_long_paragraph(paragraph, max_length)
+            if len(sub_chunks) > 1:
+                emitted = True
+                yield from sub_chunks[:-1]  # All but last
+            # The tail may be an unstripped fallback slice
+            paragraph = sub_chunks[-1].strip() if sub_chunks else ""
+            unchanged = False
+        current_parts = [paragraph]
+        current_len = len(paragraph)
+        verbatim = unchanged
+        span_start, span_end = raw_start, raw_start + len(raw)
+    
+    # Add remaining content
+    if current_len:
+        emitted = True
+        yield response[span_start:span_end] if verbatim else "\n\n".join(current_parts)
+    
+    # If we still don't have chunks, force split
+    if not emitted:
+        for chunk in force_split_response(response, max_length):
+            chunk = chunk.strip()
+            if chunk:
+                yield chunk
 
 def split_response(response: str, max_length: int = DISCORD_MAX_LENGTH) -> List[str]:
     """
@@ -24,202 +162,130 @@ def split_response(response: str, max_length: int = DISCORD_MAX_LENGTH) -> List[
     Returns:
         List of message chunks
     """
-    try:
-        if not response or not response.strip():
-            return []
-        
-        response = response.strip()
-        
-        # If response fits in one message, return as-is
-        if len(response) <= max_length:
-            return [response]
-        
-        chunks = []
-        
-        # Try to split by paragraphs first (double newlines)
-        paragraphs = response.split('\n\n')
-        current_chunk = ""
-        
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
-            
-            # If adding this paragraph would exceed limit
-            if len(current_chunk) + len(paragraph) + 2 > max_length:
-                # Save current chunk if it has content
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
-                
-                # If paragraph itself is too long, split it further
-                if len(paragraph) > max_length:
-                    sub_chunks = split_long_paragraph(paragraph, max_length)
-                    chunks.extend(sub_chunks[:-1])  # Add all but last
-                    current_chunk = sub_chunks[-1] if sub_chunks else ""
-                else:
-                    current_chunk = paragraph
-            else:
-                # Add paragraph to current chunk
-                if current_chunk:
-                    current_chunk += "\n\n" + paragraph
-                else:
-                    current_chunk = paragraph
-        
-        # Add remaining content
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        # If we still don't have chunks, force split
-        if not chunks:
-            chunks = force_split_response(response, max_length)
-        
-        # Clean up chunks
-        chunks = [chunk.strip() for chunk in chunks if chunk.strip()]
-        
-        # Log if response was split
-        if len(chunks) > 1:
-            logger.info(f"Response split into {len(chunks)} chunks")
-        
-        return chunks
-        
-    except Exception as e:
-        logger.error(f"Error splitting response: {e}")
-        # Fallback: simple character-based split
-        return force_split_response(response, max_length)
+    return list(iter_split_response(response, max_length))
 
 def split_long_paragraph(paragraph: str, max_length: int) -> List[str]:
     """Split a long paragraph using sentence boundaries"""
-    try:
-        # Try to split by sentences first
-        sentences = re.split(r'(?<=[.!?])\s+', paragraph)
-        
-        chunks = []
-        current_chunk = ""
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
+    # Try to split by sentences first
+    sentences = _SENT_RE.split(paragraph)
+    
+    chunks = []
+    current_parts = []
+    current_len = 0
+    
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        
+        # If adding this sentence would exceed limit
+        if current_len + len(sentence) + 1 > max_length:
+            # Save current chunk if it has content
+            if current_len:
+                chunks.append("".join(current_parts))
             
-            # If adding this sentence would exceed limit
-            if len(current_chunk) + len(sentence) + 1 > max_length:
-                # Save current chunk if it has content
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
-                
-                # If sentence itself is too long, split by commas or force split
-                if len(sentence) > max_length:
-                    if ',' in sentence:
-                        sub_chunks = split_by_commas(sentence, max_length)
-                        chunks.extend(sub_chunks[:-1])
-                        current_chunk = sub_chunks[-1] if sub_chunks else ""
-                    else:
-                        # Force split long sentence
-                        sub_chunks = force_split_text(sentence, max_length)
-                        chunks.extend(sub_chunks[:-1])
-                        current_chunk = sub_chunks[-1] if sub_chunks else ""
-                else:
-                    current_chunk = sentence
-            else:
-                # Add sentence to current chunk
-                if current_chunk:
-                    current_chunk += " " + sentence
+            # If sentence itself is too long, split by commas or force split
+            if len(sentence) > max_length:
+                if ',' in sentence:
+                    sub_chunks = split_by_commas(sentence, max_length)
                 else:
-                    current_chunk = sentence
-        
-        # Add remaining content
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks if chunks else [paragraph[:max_length]]
-        
-    except Exception as e:
-        logger.error(f"Error splitting paragraph: {e}")
-        return force_split_text(paragraph, max_length)
+                    # Force split long sentence
+                    sub_chunks = force_split_text(sentence, max_length)
+                chunks.extend(sub_chunks[:-1])
+                # The tail may be an unstripped fallback slice
+                sentence = sub_chunks[-1].strip() if sub_chunks else ""
+            current_parts = [sentence]
+            current_len = len(sentence)
+        else:
+            # Add sentence to current chunk
+            if current_len:
+                current_parts.append(" ")
+                current_len += 1
+            current_parts.append(sentence)
+            current_len += len(sentence)
+    
+    # Add remaining content
+    if current_len:
+        chunks.append("".join(current_parts))
+    
+    return chunks if chunks else [paragraph[:max_length]]
 
 def split_by_commas(text: str, max_length: int) -> List[str]:
     """Split text by commas when sentences are too long"""
-    try:
-        parts = text.split(',')
-        chunks = []
-        current_chunk = ""
-        
-        for part in parts:
-            part = part.strip()
-            if not part:
-                continue
+    parts = text.split(',')
+    chunks = []
+    current_parts = []
+    current_len = 0
+    
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        
+        # If adding this part would exceed limit
+        if current_len + len(part) + 1 > max_length:
+            # Save current chunk if it has content
+            if current_len:
+                chunks.append("".join(current_parts))
             
-            # If adding this part would exceed limit
-            if len(current_chunk) + len(part) + 1 > max_length:
-                # Save current chunk if it has content
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
-                
-                # If part itself is too long, force split
-                if len(part) > max_length:
-                    sub_chunks = force_split_text(part, max_length)
-                    chunks.extend(sub_chunks[:-1])
-                    current_chunk = sub_chunks[-1] if sub_chunks else ""
-                else:
-                    current_chunk = part
-            else:
-                # Add part to current chunk
-                if current_chunk:
-                    current_chunk += ", " + part
-                else:
-                    current_chunk = part
-        
-        # Add remaining content
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks if chunks else [text[:max_length]]
-        
-    except Exception as e:
-        logger.error(f"Error splitting by commas: {e}")
-        return force_split_text(text, max_length)
+            # If part itself is too long, force split
+            if len(part) > max_length:
+                sub_chunks = force_split_text(part, max_length)
+                chunks.extend(sub_chunks[:-1])
+                part = sub_chunks[-1] if sub_chunks else ""
+            current_parts = [part]
+            current_len = len(part)
+        else:
+            # Add part to current chunk
+            if current_len:
+                current_parts.append(", ")
+                current_len += 2
+            current_parts.append(part)
+            current_len += len(part)
+    
+    # Add remaining content
+    if current_len:
+        chunks.append("".join(current_parts))
+    
+    return chunks if chunks else [text[:max_length]]
 
 def force_split_text(text: str, max_length: int) -> List[str]:
     """Force split text by character count with word boundary preference"""
-    try:
-        if len(text) <= max_length:
-            return [text]
-        
-        chunks = []
-        remaining = text
-        
-        while len(remaining) > max_length:
-            # Find the best split point (prefer word boundaries)
-            split_point = max_length
-            
-            # Look for word boundary within last 100 characters
-            search_start = max(0, max_length - 100)
-            word_boundary = remaining.rfind(' ', search_start, max_length)
-            
-            if word_boundary != -1 and word_boundary > search_start:
-                split_point = word_boundary
-            
-            # Extract chunk
-            chunk = remaining[:split_point].strip()
-            if chunk:
-                chunks.append(chunk)
-            
-            # Move to next part
-            remaining = remaining[split_point:].strip()
-        
-        # Add remaining text
-        if remaining:
-            chunks.append(remaining)
-        
-        return chunks
-        
-    except Exception as e:
-        logger.error(f"Error in force split: {e}")
-        # Ultimate fallback
-        return [text[i:i+max_length] for i in range(0, len(text), max_length)]
+    if len(text) <= max_length:
+        return [text]
+    
+    chunks = []
+    # Bounds of the remaining text, tracked as offsets so it is never copied
+    start, end = 0, len(text)
+    
+    while end - start > max_length:
+        # Find the best split point (prefer word boundaries)
+        split_point = start + max_length
+        
+        # Look for word boundary within last 100 characters
+        search_start = start + max(0, max_length - 100)
+        word_boundary = text.rfind(' ', search_start, split_point)
+        
+        if word_boundary != -1 and word_boundary > search_start:
+            split_point = word_boundary
+        
+        # Extract chunk
+        chunk = text[start:split_point].strip()
+        if chunk:
+            chunks.append(chunk)
+        
+        # Move to next part, skipping surrounding whitespace
+        start = split_point
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+    
+    # Add remaining text
+    if start < end:
+        chunks.append(text[start:end])
+    
+    return chunks
 
 def force_split_response(response: str, max_length: int) -> List[str]:
     """Force split response when other methods fail"""
@@ -257,45 +323,29 @@ def force_split_response(response: str, max_length: int) -> List[str]:
         # Ultimate fallback
         return [response[:max_length]]
 
-def clean_chunk(chunk: str) -> str:
-    """Clean and format a message chunk"""
-    try:
-        # Remove excessive whitespace
-        chunk = re.sub(r'\n\s*\n\s*\n', '\n\n', chunk)  # Max 2 consecutive newlines
-        chunk = re.sub(r' +', ' ', chunk)  # Remove multiple spaces
-        
-        # Remove leading/trailing whitespace
+def _clean_and_validate(chunks: List[str], max_length: int) -> List[str]:
+    """Clean each chunk, force split any still too long and drop empty ones"""
+    result = []
+    for chunk in chunks:
+        # Collapse excess blank lines and spaces, skipping the regexes when
+        # they can't match (the blank-line pattern needs three newlines)
+        if chunk.count('\n') >= 3:
+            chunk = _MULTI_NL_RE.sub('\n\n', chunk)  # Max 2 consecutive newlines
+        if '  ' in chunk:
+            chunk = _MULTI_SP_RE.sub(' ', chunk)
         chunk = chunk.strip()
         
         # Ensure chunk doesn't start with punctuation (except specific cases)
         if chunk and chunk[0] in '.,;:!?' and len(chunk) > 1:
             chunk = chunk[1:].strip()
         
-        return chunk
-        
-    except Exception as e:
-        logger.error(f"Error cleaning chunk: {e}")
-        return chunk
-
-def validate_chunks(chunks: List[str], max_length: int = DISCORD_MAX_LENGTH) -> List[str]:
-    """Validate and fix chunks that are still too long"""
-    try:
-        validated_chunks = []
-        
-        for chunk in chunks:
-            if len(chunk) <= max_length:
-                validated_chunks.append(chunk)
-            else:
-                # Split oversized chunk
-                logger.warning(f"Chunk still too long ({len(chunk)} chars), force splitting")
-                sub_chunks = force_split_text(chunk, max_length)
-                validated_chunks.extend(sub_chunks)
-        
-        return validated_chunks
-        
-    except Exception as e:
-        logger.error(f"Error validating chunks: {e}")
-        return chunks
+        if len(chunk) <= max_length:
+            if chunk:
+                result.append(chunk)
+        else:
+            logger.warning(f"Chunk still too long ({len(chunk)} chars), force splitting")
+            result.extend(sub for sub in force_split_text(chunk, max_length) if sub.strip())
+    return result
 
 def smart_split_response(response: str, max_length: int = DISCORD_MAX_LENGTH, 
                         preserve_formatting: bool = True) -> List[str]:
@@ -311,11 +361,17 @@ def smart_split_response(response: str, max_length: int = DISCORD_MAX_LENGTH,
         List of properly formatted chunks
     """
     try:
-        if not response or not response.strip():
+        if not response:
             return []
         
+        # Most responses fit in one message and need no stripping
+        if len(response) <= max_length and not (response[0].isspace() or response[-1].isspace()):
+            return [response]
+        
         # Clean the response
         response = response.strip()
+        if not response:
+            return []
         
         # If it fits in one message, return as-is
         if len(response) <= max_length:
@@ -325,17 +381,8 @@ def smart_split_response(response: str, max_length: int = DISCORD_MAX_LENGTH,
         if preserve_formatting and '```' in response:
             return split_with_code_blocks(response, max_length)
         
-        # Regular splitting
-        chunks = split_response(response, max_length)
-        
-        # Clean and validate chunks
-        chunks = [clean_chunk(chunk) for chunk in chunks]
-        chunks = validate_chunks(chunks, max_length)
-        
-        # Remove empty chunks
-        chunks = [chunk for chunk in chunks if chunk.strip()]
-        
-        return chunks
+        # Regular splitting, then clean and validate chunks in one pass
+        return _clean_and_validate(split_response(response, max_length), max_length)
         
     except Exception as e:
         logger.error(f"Error in smart split: {e}")
@@ -345,39 +392,43 @@ def split_with_code_blocks(response: str, max_length: int) -> List[str]:
     """Split response while preserving code block integrity"""
     try:
         chunks = []
-        current_chunk = ""
+        current_parts = []
+        current_len = 0
         in_code_block = False
         
         lines = response.split('\n')
         
         for line in lines:
-            # Check for code block markers
-            if line.strip().startswith('```'):
+            # Check for code block markers, only stripping lines that contain one
+            if '```' in line and line.lstrip().startswith('```'):
                 in_code_block = not in_code_block
             
             # Calculate new length if we add this line
-            new_length = len(current_chunk) + len(line) + 1  # +1 for newline
+            new_length = current_len + len(line) + 1  # +1 for newline
             
             # If adding this line would exceed limit and we're not in a code block
-            if new_length > max_length and not in_code_block and current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = line
+            if new_length > max_length and not in_code_block and current_len:
+                chunks.append("".join(current_parts).strip())
+                current_parts = [line]
+                current_len = len(line)
             else:
                 # Add line to current chunk
-                if current_chunk:
-                    current_chunk += '\n' + line
-                else:
-                    current_chunk = line
+                if current_len:
+                    current_parts.append('\n')
+                    current_len += 1
+                current_parts.append(line)
+                current_len += len(line)
                 
                 # If we're still over limit even in a code block, we need to force split
-                if len(current_chunk) > max_length * 1.5:  # Allow some overflow for code blocks
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
+                if current_len > max_length * 1.5:  # Allow some overflow for code blocks
+                    chunks.append("".join(current_parts).strip())
+                    current_parts = []
+                    current_len = 0
                     in_code_block = False  # Reset state
         
         # Add remaining content
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_len:
+            chunks.append("".join(current_parts).strip())
         
         return chunks
         
@@ -1,23 +1,94 @@
 
 """
 Ultra-Robust Web Server for Discord AI Selfbot
-Provides multiple health check endpoints and intensive activity simulation
+Provides multiple health check endpoints with lightweight, static activity payloads
 """
 
 import asyncio
+import errno
+import socket
 import time
 import random
-import json
 import threading
 import logging
 import os
 from aiohttp import web
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+# Prefer orjson for encoding responses, falling back to the standard library
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
 logger = logging.getLogger(__name__)
 
+# Activity summary reported by the health and activity endpoints. The server no
+# longer burns CPU or memory per request, so this is a constant.
+_STATIC_ACTIVITY = {
+    'computation_cycles': 0,
+    'data_processed': 0,
+    'memory_objects': 0,
+    'cpu_intensive': False,
+    'memory_active': False
+}
+
+# Sum of squares below 1000, n(n - 1)(2n - 1) / 6 with n = 1000
+_SQSUM_1000 = 332833500
+
+# Results of the former stress loop (the sum of squares, and the size of each
+# 2000-value allocation), which never varied between requests
+_STRESS_RESULTS = [_SQSUM_1000, 2000] * 10
+
+# Filler values for the stress response, generated once at import
+_STRESS_LARGE_DATA = [random.randint(1, 10000) for _ in range(100)]
+
+# Seconds a serialized stats or ping response is reused before being rebuilt
+STATS_CACHE_TTL = 1.0
+PING_CACHE_TTL = 0.1
+
+# Ping response body; only the timestamp and request ID vary
+_PING_TEMPLATE = b'{"pong":%.6f,"ultra":true,"computation":0,"request_id":%d,"active":true}'
+
+def _json(data: Dict[str, Any], status: int = 200) -> web.Response:
+    """Build a JSON response"""
+    return _json_body(_json_dumps(data), status)
+
+def _json_body(body: bytes, status: int = 200) -> web.Response:
+    """Build a JSON response from an already serialized body"""
+    return web.Response(body=body, status=status, content_type='application/json')
+
+def _json_prefix(data: Dict[str, Any]) -> bytes:
+    """Serialize the static fields of a response, leaving the object open for more"""
+    return _json_dumps(data)[:-1]
+
+def _bind_port(port: int) -> socket.socket:
+    """Bind a listening TCP socket on all interfaces, raising OSError if the port is taken"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        # Match aiohttp's TCPSite, which reuses addresses except on Windows
+        # (where SO_REUSEADDR would let two servers share the port)
+        if os.name != 'nt':
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(('0.0.0.0', port))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
 class UltraRobustHealthServer:
     """Ultra-robust health check server with multiple endpoints"""
+    __slots__ = (
+        "port", "app", "runner", "site", "request_count", "start_time", "error_count",
+        "_stats_cache", "_ping_cache", "_health_prefix", "_activity_prefix", "_stress_prefix",
+        "_rng"
+    )
     
     def __init__(self, port=5000):
         self.port = port
@@ -26,109 +97,75 @@ class UltraRobustHealthServer:
         self.site = None
         self.request_count = 0
         self.start_time = time.time()
-        self.active_data = {}
         self.error_count = 0
-    
-    def generate_intensive_activity(self) -> Dict[str, Any]:
-        """Generate intensive computational activity"""
-        # Heavy computation to show high CPU usage
-        result = sum(i * random.randint(1, 100) for i in range(10000))
-        
-        # Memory operations
-        big_data = [random.random() for _ in range(1000)]
-        processed_data = [x * 2 + random.random() for x in big_data]
-        
-        # Store in memory to keep it active
-        current_time = time.time()
-        self.active_data[current_time] = {
-            'computation_result': result,
-            'data_size': len(processed_data),
-            'random_values': processed_data[:10],  # Keep sample
-            'timestamp': current_time
-        }
-        
-        # Clean old data
-        if len(self.active_data) > 50:
-            oldest_key = min(self.active_data.keys())
-            del self.active_data[oldest_key]
-        
-        return {
-            'computation_cycles': result,
-            'data_processed': len(processed_data),
-            'memory_objects': len(self.active_data),
-            'cpu_intensive': True,
-            'memory_active': True
-        }
+        # Own generator for the activity endpoint's random suffix
+        self._rng = random.Random(os.urandom(8))
+        # Serialized stats and ping responses with the monotonic time they were built at
+        self._stats_cache: Tuple[float, bytes] = (0.0, b'')
+        self._ping_cache: Tuple[float, bytes] = (0.0, b'')
+        # Pre-serialized static fields of the health, activity and stress
+        # responses; handlers only append the fields that change per request
+        self._health_prefix = _json_prefix({
+            "status": "ultra_healthy_24_7",
+            "service": "Discord AI Selfbot",
+            "version": "3.0.0",
+            "active": True,
+            "ultra_robust": True,
+            "activity": _STATIC_ACTIVITY
+        })
+        self._activity_prefix = _json_prefix({
+            "activity": "ultra_extreme_simulation",
+            "heavy_computation": 0,
+            "memory_result": 0.0,
+            "cpu_stress": False,
+            "memory_stress": False,
+            "ultra_active": True,
+            **_STATIC_ACTIVITY
+        })
+        self._stress_prefix = _json_prefix({
+            "stress_test": "maximum_load",
+            "stress_results": _STRESS_RESULTS,
+            "total_operations": len(_STRESS_RESULTS),
+            "memory_pressure": False,
+            "cpu_pressure": False,
+            "ultra_stress": True,
+            "large_data": _STRESS_LARGE_DATA
+        })
     
     async def health_check(self, request):
         """Enhanced health check endpoint"""
         self.request_count += 1
         
         try:
-            # Generate activity
-            activity_data = self.generate_intensive_activity()
+            now = time.time()
+            tail = (f',"uptime":{now - self.start_time!r},"request_count":{self.request_count}'
+                    f',"timestamp":{now!r},"error_count":{self.error_count}}}')
             
-            response = {
-                "status": "ultra_healthy_24_7",
-                "service": "Discord AI Selfbot",
-                "version": "3.0.0",
-                "uptime": time.time() - self.start_time,
-                "request_count": self.request_count,
-                "timestamp": time.time(),
-                "active": True,
-                "ultra_robust": True,
-                "activity": activity_data,
-                "error_count": self.error_count
-            }
-            
-            return web.json_response(response)
+            return _json_body(self._health_prefix + tail.encode())
             
         except Exception as e:
             self.error_count += 1
             logger.error(f"Health check error: {e}")
-            return web.json_response({
+            return _json({
                 "status": "error_but_running",
                 "error": str(e),
                 "timestamp": time.time()
             }, status=500)
     
     async def ultra_activity_endpoint(self, request):
-        """Ultra-intensive activity simulation endpoint"""
+        """Activity endpoint for uptime monitors"""
         try:
-            # Even more intensive operations
-            heavy_computation = 0
-            for i in range(50000):
-                heavy_computation += i * random.randint(1, 10)
-            
-            # File system simulation
-            import os
-            temp_data = f"ultra_activity_{time.time()}_{random.randint(1000, 9999)}"
-            
-            # Memory stress test
-            memory_test = [random.random() * i for i in range(5000)]
-            memory_result = sum(memory_test)
+            now = time.time()
+            # temp_data is plain ASCII, so it needs no JSON escaping
+            temp_data = f"ultra_activity_{now}_{self._rng.randint(1000, 9999)}"
+            tail = f',"timestamp":{now!r},"temp_data":"{temp_data}"}}'
             
-            activity_data = self.generate_intensive_activity()
-            
-            response = {
-                "activity": "ultra_extreme_simulation",
-                "timestamp": time.time(),
-                "heavy_computation": heavy_computation,
-                "memory_result": memory_result,
-                "memory_objects": len(memory_test),
-                "temp_data": temp_data,
-                "cpu_stress": True,
-                "memory_stress": True,
-                "ultra_active": True,
-                **activity_data
-            }
-            
-            return web.json_response(response)
+            return _json_body(self._activity_prefix + tail.encode())
             
         except Exception as e:
             self.error_count += 1
             logger.error(f"Ultra activity error: {e}")
-            return web.json_response({
+            return _json({
                 "activity": "error_but_active",
                 "error": str(e),
                 "timestamp": time.time()
@@ -137,88 +174,72 @@ class UltraRobustHealthServer:
     async def stats_endpoint(self, request):
         """Comprehensive stats endpoint"""
         try:
-            uptime = time.time() - self.start_time
+            now = time.monotonic()
+            built_at, body = self._stats_cache
+            if body and now - built_at < STATS_CACHE_TTL:
+                return _json_body(body)
+            
+            # Read the wall clock once and derive every time field from it
+            wall = time.time()
+            uptime = wall - self.start_time
+            uptime_minutes = uptime / 60
             
             response = {
                 "uptime_seconds": uptime,
-                "uptime_minutes": uptime / 60,
+                "uptime_minutes": uptime_minutes,
                 "uptime_hours": uptime / 3600,
                 "total_requests": self.request_count,
-                "requests_per_minute": self.request_count / max(uptime / 60, 1),
+                "requests_per_minute": self.request_count / max(uptime_minutes, 1),
                 "error_count": self.error_count,
                 "success_rate": (self.request_count - self.error_count) / max(self.request_count, 1),
-                "memory_objects": len(self.active_data),
+                "memory_objects": 0,
                 "status": "running_24_7_ultra_robust",
-                "last_activity": time.time(),
-                "active_data_size": len(self.active_data),
+                "last_activity": wall,
+                "active_data_size": 0,
                 "server_healthy": True
             }
             
-            return web.json_response(response)
+            body = _json_dumps(response)
+            self._stats_cache = (now, body)
+            return _json_body(body)
             
         except Exception as e:
             self.error_count += 1
             logger.error(f"Stats endpoint error: {e}")
-            return web.json_response({
+            return _json({
                 "error": str(e),
                 "timestamp": time.time()
             }, status=500)
     
     async def ping_endpoint(self, request):
-        """Enhanced ping endpoint with computation"""
+        """Enhanced ping endpoint"""
         try:
-            # Quick computation for each ping
-            ping_computation = sum(range(random.randint(100, 1000)))
+            now = time.monotonic()
+            built_at, body = self._ping_cache
+            if body and now - built_at < PING_CACHE_TTL:
+                return _json_body(body)
             
-            response = {
-                "pong": time.time(),
-                "ultra": True,
-                "computation": ping_computation,
-                "request_id": self.request_count,
-                "active": True
-            }
-            
-            return web.json_response(response)
+            body = _PING_TEMPLATE % (time.time(), self.request_count)
+            self._ping_cache = (now, body)
+            return _json_body(body)
             
         except Exception as e:
             self.error_count += 1
-            return web.json_response({
+            return _json({
                 "pong": time.time(),
                 "error": str(e)
             }, status=500)
     
     async def stress_endpoint(self, request):
-        """Stress test endpoint for maximum activity"""
+        """Stress test endpoint, reporting the fixed results of the old stress loop"""
         try:
-            # Maximum stress operations
-            stress_results = []
-            
-            for _ in range(10):
-                # Heavy computation
-                result = sum(i ** 2 for i in range(1000))
-                stress_results.append(result)
-                
-                # Memory allocation
-                temp_memory = [random.random() for _ in range(2000)]
-                stress_results.append(len(temp_memory))
-            
-            # Generate large response
-            response = {
-                "stress_test": "maximum_load",
-                "timestamp": time.time(),
-                "stress_results": stress_results,
-                "total_operations": len(stress_results),
-                "memory_pressure": True,
-                "cpu_pressure": True,
-                "ultra_stress": True,
-                "large_data": [random.randint(1, 10000) for _ in range(100)]
-            }
+            tail = f',"timestamp":{time.time()!r}}}'
             
-            return web.json_response(response)
+            return _json_body(self._stress_prefix + tail.encode())
             
         except Exception as e:
             self.error_count += 1
-            return web.json_response({
+            return _json({
                 "stress_test": "error_but_stressed",
                 "error": str(e),
                 "timestamp": time.time()
@@ -229,55 +250,51 @@ class UltraRobustHealthServer:
         max_attempts = 10
         base_port = self.port
         
+        # Find a free port by binding a plain socket, then hand the bound
+        # socket to aiohttp so the application is only built once
+        sock = None
         for attempt in range(max_attempts):
+            current_port = base_port + attempt
             try:
-                current_port = base_port + attempt
-                
-                self.app = web.Application()
-                
-                # Add all endpoints
-                self.app.router.add_get('/', self.health_check)
-                self.app.router.add_get('/health', self.health_check)
-                self.app.router.add_get('/activity', self.ultra_activity_endpoint)
-                self.app.router.add_get('/stats', self.stats_endpoint)
-                self.app.router.add_get('/ping', self.ping_endpoint)
-                self.app.router.add_get('/stress', self.stress_endpoint)
-                
-                # Add POST endpoints for more activity
-                self.app.router.add_post('/health', self.health_check)
-                self.app.router.add_post('/activity', self.ultra_activity_endpoint)
-                self.app.router.add_post('/stress', self.stress_endpoint)
-                
-                self.runner = web.AppRunner(self.app)
-                await self.runner.setup()
-                
-                self.site = web.TCPSite(self.runner, '0.0.0.0', current_port)
-                await self.site.start()
-                
-                self.port = current_port  # Update port to the one that worked
-                logger.info(f"Ultra-robust health server started on port {current_port} (attempt {attempt + 1})")
-                return
-                
+                sock = _bind_port(current_port)
+                break
             except OSError as e:
-                if "Address already in use" in str(e) and attempt < max_attempts - 1:
+                if e.errno == errno.EADDRINUSE and attempt < max_attempts - 1:
                     logger.error(f"Health server startup failed (attempt {attempt + 1}): {e}")
-                    if self.runner:
-                        try:
-                            await self.runner.cleanup()
-                        except:
-                            pass
                     continue
-                else:
-                    logger.error(f"Failed to start ultra-robust health server after {attempt + 1} attempts: {e}")
-                    raise
-            except Exception as e:
-                logger.error(f"Failed to start ultra-robust health server: {e}")
-                if self.runner:
-                    try:
-                        await self.runner.cleanup()
-                    except:
-                        pass
+                logger.error(f"Failed to start ultra-robust health server after {attempt + 1} attempts: {e}")
                 raise
+        
+        try:
+            self.app = web.Application()
+            
+            # Add all endpoints; health, activity and stress accept any
+            # method (GET and POST included) under a single route each
+            self.app.router.add_route('*', '/', self.health_check)
+            self.app.router.add_route('*', '/health', self.health_check)
+            self.app.router.add_route('*', '/activity', self.ultra_activity_endpoint)
+            self.app.router.add_get('/stats', self.stats_endpoint)
+            self.app.router.add_get('/ping', self.ping_endpoint)
+            self.app.router.add_route('*', '/stress', self.stress_endpoint)
+            
+            self.runner = web.AppRunner(self.app)
+            await self.runner.setup()
+            
+            self.site = web.SockSite(self.runner, sock)
+            await self.site.start()
+            
+            self.port = current_port  # Update port to the one that worked
+            logger.info(f"Ultra-robust health server started on port {current_port} (attempt {attempt + 1})")
+            
+        except Exception as e:
+            logger.error(f"Failed to start ultra-robust health server: {e}")
+            sock.close()
+            if self.runner:
+                try:
+                    await self.runner.cleanup()
+                except:
+                    pass
+            raise
     
     async def stop_server(self):
         """Stop the health check server"""